@@ -5,9 +5,13 @@ and provide recommendations for tuning.
 """
 
 import logging
+import operator
+import statistics
+from bisect import bisect_right
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +34,20 @@ class Severity(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+# Enum value lookups used when summarizing
+_TYPE_NAMES = {t: t.value for t in BottleneckType}
+_SEVERITY_NAMES = {s: s.value for s in Severity}
+
+# Order in which bottlenecks are reported, most severe first
+SEVERITY_ORDER = (
+    Severity.CRITICAL,
+    Severity.HIGH,
+    Severity.MEDIUM,
+    Severity.LOW
+)
+
+
+@dataclass(slots=True)
 class Bottleneck:
     """Represents a detected bottleneck."""
     type: BottleneckType
@@ -85,9 +102,19 @@ class BottleneckDetector:
     QUEUE_WARNING_THRESHOLD = 10
     ERROR_RATE_WARNING = 1  # percentage
     ERROR_RATE_HIGH = 5
+    TREND_WINDOW = 10  # samples used for connection trend detection
+    CORRELATION_THRESHOLD = 0.7  # Pearson r
+    CORRELATION_MIN_SAMPLES = 10
 
     def __init__(self):
         self.bottlenecks: List[Bottleneck] = []
+        self._by_severity: Dict[Severity, List[Bottleneck]] = {
+            severity: [] for severity in SEVERITY_ORDER
+        }
+
+    def _add(self, bottleneck: Bottleneck):
+        """Record a detected bottleneck in its severity bucket."""
+        self._by_severity[bottleneck.severity].append(bottleneck)
 
     def analyze(
         self,
@@ -105,7 +132,8 @@ class BottleneckDetector:
         Returns:
             List of detected Bottleneck objects
         """
-        self.bottlenecks = []
+        for bucket in self._by_severity.values():
+            bucket.clear()
 
         if haproxy_stats:
             self._analyze_haproxy(haproxy_stats)
@@ -120,15 +148,14 @@ class BottleneckDetector:
         if haproxy_stats and system_metrics:
             self._analyze_correlations(haproxy_stats, system_metrics)
 
-        # Sort by severity
-        severity_order = {
-            Severity.CRITICAL: 0,
-            Severity.HIGH: 1,
-            Severity.MEDIUM: 2,
-            Severity.LOW: 3
-        }
-        self.bottlenecks.sort(key=lambda b: severity_order[b.severity])
+        return self._collect()
 
+    def _collect(self) -> List[Bottleneck]:
+        """Concatenate severity buckets into self.bottlenecks."""
+        self.bottlenecks = [
+            b for severity in SEVERITY_ORDER
+            for b in self._by_severity[severity]
+        ]
         return self.bottlenecks
 
     def _analyze_haproxy(self, stats: List[Dict]):
@@ -147,7 +174,7 @@ class BottleneckDetector:
             saturation = (scur / slim) * 100
 
             if saturation >= self.CONNECTION_SATURATION_CRITICAL:
-                self.bottlenecks.append(Bottleneck(
+                self._add(Bottleneck(
                     type=BottleneckType.CONNECTION_LIMIT,
                     severity=Severity.CRITICAL,
                     description=(
@@ -167,7 +194,7 @@ class BottleneckDetector:
                     affected_component="amphora/haproxy"
                 ))
             elif saturation >= self.CONNECTION_SATURATION_HIGH:
-                self.bottlenecks.append(Bottleneck(
+                self._add(Bottleneck(
                     type=BottleneckType.CONNECTION_LIMIT,
                     severity=Severity.HIGH,
                     description=(
@@ -190,7 +217,7 @@ class BottleneckDetector:
         qcur = latest.get('qcur', 0) or 0
         if qcur > self.QUEUE_WARNING_THRESHOLD:
             severity = Severity.HIGH if qcur > 50 else Severity.MEDIUM
-            self.bottlenecks.append(Bottleneck(
+            self._add(Bottleneck(
                 type=BottleneckType.BACKEND,
                 severity=severity,
                 description=f"Requests queuing: {qcur} in queue",
@@ -208,7 +235,7 @@ class BottleneckDetector:
         if stot > 0:
             error_rate = (ereq / stot) * 100
             if error_rate >= self.ERROR_RATE_HIGH:
-                self.bottlenecks.append(Bottleneck(
+                self._add(Bottleneck(
                     type=BottleneckType.CONFIGURATION,
                     severity=Severity.HIGH,
                     description=f"High error rate: {error_rate:.2f}%",
@@ -224,7 +251,7 @@ class BottleneckDetector:
                     affected_component="amphora/haproxy"
                 ))
             elif error_rate >= self.ERROR_RATE_WARNING:
-                self.bottlenecks.append(Bottleneck(
+                self._add(Bottleneck(
                     type=BottleneckType.CONFIGURATION,
                     severity=Severity.MEDIUM,
                     description=f"Elevated error rate: {error_rate:.2f}%",
@@ -238,12 +265,13 @@ class BottleneckDetector:
                 ))
 
         # Analyze trend for connection growth
-        if len(stats) >= 10:
-            recent_scur = [s.get('scur', 0) or 0 for s in stats[-10:]]
-            if all(recent_scur[i] <= recent_scur[i+1]
-                   for i in range(len(recent_scur)-1)):
+        if len(stats) >= self.TREND_WINDOW:
+            recent_scur = [
+                s.get('scur', 0) or 0 for s in stats[-self.TREND_WINDOW:]
+            ]
+            if all(map(operator.le, recent_scur, recent_scur[1:])):
                 # Monotonically increasing connections
-                self.bottlenecks.append(Bottleneck(
+                self._add(Bottleneck(
                     type=BottleneckType.CONNECTION_LIMIT,
                     severity=Severity.MEDIUM,
                     description="Connections continuously increasing",
@@ -261,26 +289,42 @@ class BottleneckDetector:
         if not metrics:
             return
 
-        # Separate amphora and backend metrics
-        amphora_metrics = [
-            m for m in metrics
-            if 'amphora' in m.get('host_type', '').lower()
-        ]
-        backend_metrics = [
-            m for m in metrics
-            if 'backend' in m.get('host_type', '').lower()
-        ]
+        # Only the latest amphora and backend samples are analyzed
+        latest = self._latest_by_host_type(metrics, ('amphora', 'backend'))
 
-        self._analyze_host_metrics(amphora_metrics, "amphora")
-        self._analyze_host_metrics(backend_metrics, "backend")
+        for host_type in ('amphora', 'backend'):
+            if host_type in latest:
+                self._analyze_host_metrics(latest[host_type], host_type)
 
-    def _analyze_host_metrics(self, metrics: List[Dict], host_type: str):
-        """Analyze metrics for a specific host type."""
-        if not metrics:
-            return
+    @staticmethod
+    def _latest_by_host_type(
+        metrics: List[Dict],
+        host_types: Tuple[str, ...]
+    ) -> Dict[str, Dict]:
+        """Find the most recent sample for each host type.
+
+        Walks the time series backwards and stops as soon as every host
+        type has been seen, so long runs are not rescanned in full.
 
-        latest = metrics[-1]
+        Args:
+            metrics: Time-series system metrics
+            host_types: Host type substrings to look for
 
+        Returns:
+            Dictionary mapping host type to its latest sample
+        """
+        latest = {}
+        for m in reversed(metrics):
+            sample_type = m.get('host_type', '').lower()
+            for host_type in host_types:
+                if host_type not in latest and host_type in sample_type:
+                    latest[host_type] = m
+            if len(latest) == len(host_types):
+                break
+        return latest
+
+    def _analyze_host_metrics(self, latest: Dict, host_type: str):
+        """Analyze the latest metrics sample for a specific host type."""
         # CPU analysis
         cpu_count = latest.get('cpu_count', 1) or 1
         load = latest.get('load_1', 0) or 0
@@ -288,7 +332,7 @@ class BottleneckDetector:
         # Load average based CPU saturation
         cpu_saturation = (load / cpu_count) * 100
         if cpu_saturation >= self.CPU_CRITICAL_THRESHOLD:
-            self.bottlenecks.append(Bottleneck(
+            self._add(Bottleneck(
                 type=BottleneckType.CPU,
                 severity=Severity.CRITICAL,
                 description=(
@@ -308,7 +352,7 @@ class BottleneckDetector:
                 affected_component=host_type
             ))
         elif cpu_saturation >= self.CPU_HIGH_THRESHOLD:
-            self.bottlenecks.append(Bottleneck(
+            self._add(Bottleneck(
                 type=BottleneckType.CPU,
                 severity=Severity.HIGH,
                 description=(
@@ -333,7 +377,7 @@ class BottleneckDetector:
         mem_free_pct = (mem_free / mem_total) * 100
 
         if mem_free_pct < self.MEMORY_CRITICAL_THRESHOLD:
-            self.bottlenecks.append(Bottleneck(
+            self._add(Bottleneck(
                 type=BottleneckType.MEMORY,
                 severity=Severity.CRITICAL,
                 description=(
@@ -353,7 +397,7 @@ class BottleneckDetector:
                 affected_component=host_type
             ))
         elif mem_free_pct < self.MEMORY_LOW_THRESHOLD:
-            self.bottlenecks.append(Bottleneck(
+            self._add(Bottleneck(
                 type=BottleneckType.MEMORY,
                 severity=Severity.HIGH,
                 description=(
@@ -386,7 +430,7 @@ class BottleneckDetector:
         if num_requests > 0:
             failure_rate = (num_failures / num_requests) * 100
             if failure_rate >= 10:
-                self.bottlenecks.append(Bottleneck(
+                self._add(Bottleneck(
                     type=BottleneckType.CONFIGURATION,
                     severity=Severity.CRITICAL,
                     description=f"High request failure rate: {failure_rate:.1f}%",
@@ -405,7 +449,7 @@ class BottleneckDetector:
         # High response times
         p99 = latest.get('p99', 0) or 0
         if p99 > 5000:  # 5 seconds
-            self.bottlenecks.append(Bottleneck(
+            self._add(Bottleneck(
                 type=BottleneckType.BACKEND,
                 severity=Severity.HIGH,
                 description=f"High p99 response time: {p99}ms",
@@ -426,10 +470,85 @@ class BottleneckDetector:
         haproxy_stats: List[Dict],
         system_metrics: List[Dict]
     ):
-        """Analyze correlations between different metrics."""
-        # This would require time-aligned data
-        # For now, just check if high CPU correlates with queue growth
-        pass
+        """Analyze correlations between different metrics.
+
+        Each amphora sample is time-aligned with the most recent HAProxy
+        sample at or before it, then the Pearson correlation between
+        amphora CPU load and queue length is computed at lags of -1, 0
+        and +1 samples. A strong correlation means requests queue because
+        the amphora itself is CPU bound rather than the backends.
+
+        Every HAProxy sample is stored as several rows with the same
+        timestamp (frontends, backends and servers); its queue length is
+        the qcur sum over the BACKEND rows.
+        """
+        backend_qcur: Dict[Any, int] = {}
+        for s in haproxy_stats:
+            if s.get('server_name') != 'BACKEND':
+                continue
+            timestamp = s.get('timestamp')
+            if timestamp is None:
+                return
+            backend_qcur[timestamp] = (
+                backend_qcur.get(timestamp, 0) + (s.get('qcur', 0) or 0)
+            )
+        haproxy_times = sorted(backend_qcur)
+
+        cpu_load = []
+        queue = []
+        for m in system_metrics:
+            timestamp = m.get('timestamp')
+            if timestamp is None or \
+                    'amphora' not in m.get('host_type', '').lower():
+                continue
+
+            idx = bisect_right(haproxy_times, timestamp) - 1
+            if idx < 0:
+                continue
+
+            cpu_count = m.get('cpu_count', 1) or 1
+            cpu_load.append((m.get('load_1', 0) or 0) / cpu_count * 100)
+            queue.append(backend_qcur[haproxy_times[idx]])
+
+        if len(cpu_load) < self.CORRELATION_MIN_SAMPLES:
+            return
+
+        # Positive lag: queue length leads CPU load by that many samples
+        best = None
+        n = len(cpu_load)
+        for lag in (-1, 0, 1):
+            cpu = cpu_load[max(lag, 0):n + min(lag, 0)]
+            qcur = queue[max(-lag, 0):n + min(-lag, 0)]
+            try:
+                r = statistics.correlation(cpu, qcur)
+            except statistics.StatisticsError:
+                # One of the series is constant
+                continue
+            if best is None or r > best[0]:
+                best = (r, lag)
+
+        if best is None or best[0] <= self.CORRELATION_THRESHOLD:
+            return
+
+        r, lag = best
+        self._add(Bottleneck(
+            type=BottleneckType.CPU,
+            severity=Severity.MEDIUM,
+            description=(
+                f"Request queue tracks amphora CPU load (r={r:.2f})"
+            ),
+            evidence={
+                'correlation': r,
+                'lag_samples': lag,
+                'samples': n
+            },
+            recommendation=(
+                "Requests queue when amphora CPU load rises. Use a "
+                "larger amphora flavor or add amphora instances before "
+                "scaling the backend pool."
+            ),
+            affected_component="amphora"
+        ))
 
     def get_summary(self) -> Dict[str, Any]:
         """Get a summary of all detected bottlenecks.
@@ -437,15 +556,10 @@ class BottleneckDetector:
         Returns:
             Dictionary with bottleneck summary
         """
-        by_type = {}
-        by_severity = {}
-
-        for b in self.bottlenecks:
-            type_name = b.type.value
-            severity_name = b.severity.value
-
-            by_type[type_name] = by_type.get(type_name, 0) + 1
-            by_severity[severity_name] = by_severity.get(severity_name, 0) + 1
+        by_type = dict(Counter(_TYPE_NAMES[b.type] for b in self.bottlenecks))
+        by_severity = dict(
+            Counter(_SEVERITY_NAMES[b.severity] for b in self.bottlenecks)
+        )
 
         return {
             'total_bottlenecks': len(self.bottlenecks),
@@ -4,15 +4,25 @@ Generates matplotlib charts for metrics visualization.
 """
 
 import logging
-from datetime import datetime
+import operator
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 try:
+    import matplotlib
+    # Plots are only ever written to files, so never probe GUI backends
+    matplotlib.use('Agg', force=True)
+    matplotlib.rcParams['path.simplify'] = True
+    matplotlib.rcParams['path.simplify_threshold'] = 1.0
+    matplotlib.rcParams['agg.path.chunksize'] = 10000
     import matplotlib.pyplot as plt
     import matplotlib.dates as mdates
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    import numpy as np
+    from PIL import Image
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
@@ -28,6 +38,84 @@ def ensure_matplotlib():
         )
 
 
+def _to_columns(
+    rows: List[Dict],
+    keys: Tuple[str, ...],
+    default: float = 0
+) -> Dict[str, "np.ndarray"]:
+    """Convert a list of sample dicts into per-key NumPy column arrays.
+
+    Values are pulled with a single itemgetter pass over the rows and
+    converted to one 2-D array; missing, None and zero values are then
+    coalesced to ``default`` (matching ``s.get(key, default) or default``).
+
+    Args:
+        rows: Time-series samples
+        keys: Keys to extract
+        default: Value used for missing or falsy entries
+
+    Returns:
+        Dictionary mapping each key to a float64 array
+    """
+    getter = operator.itemgetter(*keys)
+    try:
+        values = list(map(getter, rows))
+    except KeyError:
+        values = [tuple(r.get(key) for key in keys) for r in rows]
+
+    # None converts to NaN, so nulls and zeros can be coalesced in one step
+    table = np.array(values, dtype=np.float64).reshape(len(rows), len(keys))
+    table[np.isnan(table) | (table == 0)] = default
+    table = np.ascontiguousarray(table.T)
+
+    return {key: table[i] for i, key in enumerate(keys)}
+
+
+def _lttb_indices(y: "np.ndarray", threshold: int) -> "np.ndarray":
+    """Select points with largest-triangle-three-buckets downsampling.
+
+    Keeps the first and last points and, for each of the remaining
+    ``threshold - 2`` buckets, the point forming the largest triangle
+    with the previously selected point and the average of the next
+    bucket. Samples are assumed to be evenly spaced.
+
+    Args:
+        y: Series values
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted indices of the selected points
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        avg_x = (end + next_end - 1) / 2
+        avg_y = y[end:next_end].mean()
+
+        bucket_x = np.arange(start, end)
+        area = np.abs(
+            (a - avg_x) * (y[start:end] - y[a])
+            - (a - bucket_x) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+
+    return indices
+
+
 class MetricsPlotter:
     """Creates visualizations for performance metrics."""
 
@@ -35,7 +123,8 @@ class MetricsPlotter:
         self,
         output_dir: str = "./reports/plots",
         figsize: Tuple[int, int] = (12, 6),
-        dpi: int = 100
+        dpi: int = 100,
+        max_points: int = 2000
     ):
         """Initialize the plotter.
 
@@ -43,16 +132,89 @@ class MetricsPlotter:
             output_dir: Directory to save plot images
             figsize: Default figure size (width, height)
             dpi: Resolution for saved images
+            max_points: Series longer than this are downsampled with
+                LTTB before plotting (0 disables downsampling)
         """
         ensure_matplotlib()
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.figsize = figsize
         self.dpi = dpi
+        self.max_points = max_points
 
         # Set style
         plt.style.use('seaborn-v0_8-whitegrid')
 
+        # Figures are reused per (nrows, figsize) geometry
+        self._fig_cache: Dict[Tuple, Tuple[Any, List[Any]]] = {}
+        self._time_fmt = mdates.DateFormatter('%H:%M:%S')
+
+    def _get_figure(
+        self,
+        nrows: int,
+        figsize: Tuple[int, int]
+    ) -> Tuple[Any, List[Any]]:
+        """Get a figure and cleared axes for the given geometry.
+
+        The figure is created on first use and reused by later plots
+        with the same layout, avoiding canvas and font setup per plot.
+
+        Args:
+            nrows: Number of vertically stacked axes
+            figsize: Figure size (width, height)
+
+        Returns:
+            Tuple of (figure, list of axes)
+        """
+        key = (nrows, tuple(figsize))
+        cached = self._fig_cache.get(key)
+
+        if cached is None:
+            fig = Figure(figsize=figsize, dpi=self.dpi, layout='tight')
+            FigureCanvasAgg(fig)
+            axes = list(fig.subplots(nrows, 1, squeeze=False)[:, 0])
+            cached = self._fig_cache[key] = (fig, axes)
+        else:
+            for ax in cached[1]:
+                ax.cla()
+
+        return cached
+
+    def _points(self, x: Any, y: Any) -> Tuple[Any, Any]:
+        """Downsample a series to max_points for plotting.
+
+        Args:
+            x: X-axis values (array)
+            y: Y-axis values (array)
+
+        Returns:
+            Tuple of (x, y), reduced with LTTB when longer than max_points
+        """
+        if not self.max_points or len(y) <= self.max_points:
+            return x, y
+        idx = _lttb_indices(y, self.max_points)
+        return x[idx], y[idx]
+
+    def _save(self, fig: Any, filename: str) -> str:
+        """Render a figure to a PNG file in the output directory.
+
+        Draws straight to the Agg buffer and encodes it with PIL at the
+        fastest zlib level, bypassing savefig's print pipeline.
+        """
+        filepath = self.output_dir / filename
+        canvas = fig.canvas
+        canvas.draw()
+        Image.fromarray(np.asarray(canvas.buffer_rgba())).save(
+            filepath, format='PNG', compress_level=1
+        )
+        return str(filepath)
+
+    def close(self):
+        """Release all cached figures."""
+        for fig, _ in self._fig_cache.values():
+            fig.clear()
+        self._fig_cache.clear()
+
     def plot_connections_over_time(
         self,
         haproxy_stats: List[Dict],
@@ -70,45 +232,45 @@ class MetricsPlotter:
         if not haproxy_stats:
             return ""
 
-        fig, ax = plt.subplots(figsize=self.figsize)
+        fig, (ax,) = self._get_figure(1, self.figsize)
 
-        # Extract data
-        timestamps = [
-            datetime.fromisoformat(s['timestamp'])
-            for s in haproxy_stats
-            if 'timestamp' in s
-        ]
-        current = [s.get('scur', 0) or 0 for s in haproxy_stats]
-        limit = [s.get('slim', 0) or 0 for s in haproxy_stats]
+        # Extract data; NumPy parses ISO 8601 strings in C and matplotlib
+        # plots datetime64 arrays directly
+        timestamps = np.array(
+            [s['timestamp'] for s in haproxy_stats if 'timestamp' in s],
+            dtype='datetime64[us]'
+        )
+        cols = _to_columns(haproxy_stats, ('scur', 'slim'))
+        current = cols['scur']
+        limit = cols['slim']
+        has_limit = bool(limit.any())
 
-        if not timestamps:
+        if not timestamps.size:
             # Use index as x-axis
-            x = range(len(current))
-            ax.plot(x, current, label='Current Connections', linewidth=2)
-            if any(limit):
-                ax.plot(x, limit, '--', label='Connection Limit',
+            x = np.arange(len(current))
+            ax.plot(*self._points(x, current),
+                    label='Current Connections', linewidth=2)
+            if has_limit:
+                ax.plot(*self._points(x, limit), '--',
+                        label='Connection Limit',
                         linewidth=1, alpha=0.7)
             ax.set_xlabel('Sample')
         else:
-            ax.plot(timestamps, current, label='Current Connections',
+            ax.plot(*self._points(timestamps, current),
+                    label='Current Connections',
                     linewidth=2)
-            if any(limit):
-                ax.plot(timestamps, limit, '--', label='Connection Limit',
+            if has_limit:
+                ax.plot(*self._points(timestamps, limit), '--',
+                        label='Connection Limit',
                         linewidth=1, alpha=0.7)
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-            plt.xticks(rotation=45)
+            ax.xaxis.set_major_formatter(self._time_fmt)
+            ax.tick_params(axis='x', labelrotation=45)
 
         ax.set_ylabel('Connections')
         ax.set_title('Connection Count Over Time')
         ax.legend()
 
-        # Save
-        filepath = self.output_dir / filename
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=self.dpi)
-        plt.close()
-
-        return str(filepath)
+        return self._save(fig, filename)
 
     def plot_throughput(
         self,
@@ -127,36 +289,36 @@ class MetricsPlotter:
         if not haproxy_stats:
             return ""
 
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(self.figsize[0], 10))
+        fig, (ax1, ax2) = self._get_figure(2, (self.figsize[0], 10))
 
         # Bytes
-        bytes_in = [s.get('bin', 0) or 0 for s in haproxy_stats]
-        bytes_out = [s.get('bout', 0) or 0 for s in haproxy_stats]
-        x = range(len(bytes_in))
+        cols = _to_columns(haproxy_stats, ('bin', 'bout', 'req_tot'))
+        x = np.arange(len(haproxy_stats))
 
-        ax1.plot(x, [b / 1024 / 1024 for b in bytes_in],
+        # Convert to MB in place; the columns are not reused
+        mb_in = cols['bin']
+        mb_in *= (1.0 / 1048576.0)
+        mb_out = cols['bout']
+        mb_out *= (1.0 / 1048576.0)
+
+        ax1.plot(*self._points(x, mb_in),
                  label='Bytes In (MB)', linewidth=2)
-        ax1.plot(x, [b / 1024 / 1024 for b in bytes_out],
+        ax1.plot(*self._points(x, mb_out),
                  label='Bytes Out (MB)', linewidth=2)
         ax1.set_ylabel('Cumulative MB')
         ax1.set_title('Data Transfer')
         ax1.legend()
 
         # Requests
-        requests = [s.get('req_tot', 0) or 0 for s in haproxy_stats]
-        ax2.plot(x, requests, label='Total Requests',
+        ax2.plot(*self._points(x, cols['req_tot']),
+                 label='Total Requests',
                  linewidth=2, color='green')
         ax2.set_ylabel('Requests')
         ax2.set_xlabel('Sample')
         ax2.set_title('Request Count')
         ax2.legend()
 
-        filepath = self.output_dir / filename
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=self.dpi)
-        plt.close()
-
-        return str(filepath)
+        return self._save(fig, filename)
 
     def plot_system_utilization(
         self,
@@ -186,16 +348,18 @@ class MetricsPlotter:
         if not metrics:
             return ""
 
-        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(self.figsize[0], 12))
+        fig, (ax1, ax2, ax3) = self._get_figure(3, (self.figsize[0], 12))
 
-        x = range(len(metrics))
+        x = np.arange(len(metrics))
 
         # CPU (using load average as proxy)
         cpu_count = metrics[0].get('cpu_count', 1) or 1
-        load = [m.get('load_1', 0) or 0 for m in metrics]
-        cpu_util = [(l / cpu_count) * 100 for l in load]
+        cols = _to_columns(metrics, ('load_1', 'mem_free'))
+        load = cols['load_1']
+        cpu_util = load * (100.0 / cpu_count)
 
-        ax1.plot(x, cpu_util, label='CPU Utilization %', linewidth=2)
+        ax1.plot(*self._points(x, cpu_util),
+                 label='CPU Utilization %', linewidth=2)
         ax1.axhline(y=80, color='orange', linestyle='--',
                     label='Warning (80%)', alpha=0.7)
         ax1.axhline(y=95, color='red', linestyle='--',
@@ -206,14 +370,13 @@ class MetricsPlotter:
         ax1.set_ylim(0, 120)
 
         # Memory
-        mem_total = [m.get('mem_total', 1) or 1 for m in metrics]
-        mem_free = [m.get('mem_free', 0) or 0 for m in metrics]
-        mem_util = [
-            ((t - f) / t) * 100
-            for t, f in zip(mem_total, mem_free)
-        ]
+        mem_total = _to_columns(
+            metrics, ('mem_total',), default=1
+        )['mem_total']
+        mem_util = (mem_total - cols['mem_free']) / mem_total * 100.0
 
-        ax2.plot(x, mem_util, label='Memory Utilization %',
+        ax2.plot(*self._points(x, mem_util),
+                 label='Memory Utilization %',
                  linewidth=2, color='purple')
         ax2.axhline(y=90, color='orange', linestyle='--',
                     label='Warning (90%)', alpha=0.7)
@@ -223,7 +386,8 @@ class MetricsPlotter:
         ax2.set_ylim(0, 100)
 
         # Load average
-        ax3.plot(x, load, label='Load Average (1min)', linewidth=2)
+        ax3.plot(*self._points(x, load),
+                 label='Load Average (1min)', linewidth=2)
         ax3.axhline(y=cpu_count, color='orange', linestyle='--',
                     label=f'CPU Count ({cpu_count})', alpha=0.7)
         ax3.set_ylabel('Load')
@@ -231,12 +395,7 @@ class MetricsPlotter:
         ax3.set_title(f'{host_type.title()} Load Average')
         ax3.legend()
 
-        filepath = self.output_dir / filename
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=self.dpi)
-        plt.close()
-
-        return str(filepath)
+        return self._save(fig, filename)
 
     def plot_response_times(
         self,
@@ -255,30 +414,20 @@ class MetricsPlotter:
         if not locust_stats:
             return ""
 
-        fig, ax = plt.subplots(figsize=self.figsize)
+        fig, (ax,) = self._get_figure(1, self.figsize)
 
-        x = range(len(locust_stats))
-        p50 = [s.get('p50', 0) or 0 for s in locust_stats]
-        p90 = [s.get('p90', 0) or 0 for s in locust_stats]
-        p95 = [s.get('p95', 0) or 0 for s in locust_stats]
-        p99 = [s.get('p99', 0) or 0 for s in locust_stats]
+        x = np.arange(len(locust_stats))
+        cols = _to_columns(locust_stats, ('p50', 'p90', 'p95', 'p99'))
 
-        ax.plot(x, p50, label='p50', linewidth=2)
-        ax.plot(x, p90, label='p90', linewidth=2)
-        ax.plot(x, p95, label='p95', linewidth=2)
-        ax.plot(x, p99, label='p99', linewidth=2)
+        for key, values in cols.items():
+            ax.plot(*self._points(x, values), label=key, linewidth=2)
 
         ax.set_ylabel('Response Time (ms)')
         ax.set_xlabel('Sample')
         ax.set_title('Response Time Percentiles Over Time')
         ax.legend()
 
-        filepath = self.output_dir / filename
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=self.dpi)
-        plt.close()
-
-        return str(filepath)
+        return self._save(fig, filename)
 
     def plot_error_rates(
         self,
@@ -297,15 +446,17 @@ class MetricsPlotter:
         if not haproxy_stats:
             return ""
 
-        fig, ax = plt.subplots(figsize=self.figsize)
+        fig, (ax,) = self._get_figure(1, self.figsize)
 
-        x = range(len(haproxy_stats))
-        errors = [s.get('ereq', 0) or 0 for s in haproxy_stats]
-        total = [s.get('stot', 1) or 1 for s in haproxy_stats]
-        error_rate = [(e / t) * 100 if t > 0 else 0
-                      for e, t in zip(errors, total)]
+        x = np.arange(len(haproxy_stats))
+        errors = _to_columns(haproxy_stats, ('ereq',))['ereq']
+        total = _to_columns(haproxy_stats, ('stot',), default=1)['stot']
+        error_rate = np.divide(
+            errors, total, out=np.zeros_like(errors), where=total > 0
+        ) * 100
 
-        ax.plot(x, error_rate, label='Error Rate %',
+        ax.plot(*self._points(x, error_rate),
+                label='Error Rate %',
                 linewidth=2, color='red')
         ax.axhline(y=1, color='orange', linestyle='--',
                    label='Warning (1%)', alpha=0.7)
@@ -317,12 +468,7 @@ class MetricsPlotter:
         ax.set_title('Request Error Rate Over Time')
         ax.legend()
 
-        filepath = self.output_dir / filename
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=self.dpi)
-        plt.close()
-
-        return str(filepath)
+        return self._save(fig, filename)
 
     def generate_all_plots(
         self,
@@ -3,8 +3,10 @@
 Generates HTML reports with visualizations and analysis.
 """
 
+import gzip
 import json
 import logging
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -15,6 +17,12 @@ from .bottleneck_detector import BottleneckDetector, Bottleneck
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # HTML template for the report
 REPORT_TEMPLATE = """
 <!DOCTYPE html>
@@ -168,19 +176,19 @@ REPORT_TEMPLATE = """
     <!-- Summary Metrics -->
     <section class="grid">
         <div class="metric-card">
-            <div class="metric-value">{{ summary.total_requests | default(0) | int }}</div>
+            <div class="metric-value">{{ summary.total_requests | int }}</div>
             <div class="metric-label">Total Requests</div>
         </div>
         <div class="metric-card">
-            <div class="metric-value">{{ "%.1f" | format(summary.requests_per_sec | default(0)) }}</div>
+            <div class="metric-value">{{ "%.1f" | format(summary.requests_per_sec) }}</div>
             <div class="metric-label">Requests/sec (avg)</div>
         </div>
         <div class="metric-card">
-            <div class="metric-value">{{ "%.0f" | format(summary.avg_response_time | default(0)) }}ms</div>
+            <div class="metric-value">{{ "%.0f" | format(summary.avg_response_time) }}ms</div>
             <div class="metric-label">Avg Response Time</div>
         </div>
         <div class="metric-card">
-            <div class="metric-value">{{ "%.2f" | format(summary.error_rate | default(0)) }}%</div>
+            <div class="metric-value">{{ "%.2f" | format(summary.error_rate) }}%</div>
             <div class="metric-label">Error Rate</div>
         </div>
     </section>
@@ -199,13 +207,7 @@ REPORT_TEMPLATE = """
             {% endif %}
         </div>
 
-        {% for b in bottlenecks %}
-        <div class="bottleneck severity-{{ b.severity.value }}">
-            <div class="bottleneck-type">{{ b.type.value }} - {{ b.severity.value }}</div>
-            <div class="bottleneck-desc">{{ b.description }}</div>
-            <div class="bottleneck-rec">Recommendation: {{ b.recommendation }}</div>
-        </div>
-        {% endfor %}
+        {{ bottleneck_html }}
     </section>
     {% endif %}
 
@@ -222,19 +224,19 @@ REPORT_TEMPLATE = """
             </tr>
             <tr>
                 <td>Peak Concurrent Connections</td>
-                <td>{{ haproxy_summary.max_connections | default(0) }}</td>
+                <td>{{ haproxy_summary.max_connections }}</td>
             </tr>
             <tr>
                 <td>Total Connections</td>
-                <td>{{ haproxy_summary.total_connections | default(0) }}</td>
+                <td>{{ haproxy_summary.total_connections }}</td>
             </tr>
             <tr>
                 <td>Connection Limit</td>
-                <td>{{ haproxy_summary.connection_limit | default(0) }}</td>
+                <td>{{ haproxy_summary.connection_limit }}</td>
             </tr>
             <tr>
                 <td>Peak Utilization</td>
-                <td>{{ "%.1f" | format(haproxy_summary.peak_utilization | default(0)) }}%</td>
+                <td>{{ "%.1f" | format(haproxy_summary.peak_utilization) }}%</td>
             </tr>
         </table>
 
@@ -246,15 +248,15 @@ REPORT_TEMPLATE = """
             </tr>
             <tr>
                 <td>Total Bytes In</td>
-                <td>{{ haproxy_summary.bytes_in | default(0) | filesizeformat }}</td>
+                <td>{{ haproxy_summary.bytes_in | filesizeformat }}</td>
             </tr>
             <tr>
                 <td>Total Bytes Out</td>
-                <td>{{ haproxy_summary.bytes_out | default(0) | filesizeformat }}</td>
+                <td>{{ haproxy_summary.bytes_out | filesizeformat }}</td>
             </tr>
             <tr>
                 <td>Total Requests</td>
-                <td>{{ haproxy_summary.total_requests | default(0) }}</td>
+                <td>{{ haproxy_summary.total_requests }}</td>
             </tr>
         </table>
 
@@ -265,11 +267,11 @@ REPORT_TEMPLATE = """
                 <th>Count</th>
                 <th>Percentage</th>
             </tr>
-            {% for code, count in haproxy_summary.http_codes.items() %}
+            {% for code, count, pct in haproxy_summary.http_codes %}
             <tr>
                 <td>{{ code }}xx</td>
                 <td>{{ count }}</td>
-                <td>{{ "%.1f" | format(count / haproxy_summary.total_requests * 100 if haproxy_summary.total_requests else 0) }}%</td>
+                <td>{{ pct }}%</td>
             </tr>
             {% endfor %}
         </table>
@@ -290,18 +292,18 @@ REPORT_TEMPLATE = """
             </tr>
             <tr>
                 <td>CPU Utilization</td>
-                <td>{{ "%.1f" | format(system_summary.amphora.avg_cpu | default(0)) }}%</td>
-                <td>{{ "%.1f" | format(system_summary.amphora.max_cpu | default(0)) }}%</td>
+                <td>{{ "%.1f" | format(system_summary.amphora.avg_cpu) }}%</td>
+                <td>{{ "%.1f" | format(system_summary.amphora.max_cpu) }}%</td>
             </tr>
             <tr>
                 <td>Memory Utilization</td>
-                <td>{{ "%.1f" | format(system_summary.amphora.avg_memory | default(0)) }}%</td>
-                <td>{{ "%.1f" | format(system_summary.amphora.max_memory | default(0)) }}%</td>
+                <td>{{ "%.1f" | format(system_summary.amphora.avg_memory) }}%</td>
+                <td>{{ "%.1f" | format(system_summary.amphora.max_memory) }}%</td>
             </tr>
             <tr>
                 <td>Load Average (1min)</td>
-                <td>{{ "%.2f" | format(system_summary.amphora.avg_load | default(0)) }}</td>
-                <td>{{ "%.2f" | format(system_summary.amphora.max_load | default(0)) }}</td>
+                <td>{{ "%.2f" | format(system_summary.amphora.avg_load) }}</td>
+                <td>{{ "%.2f" | format(system_summary.amphora.max_load) }}</td>
             </tr>
         </table>
 
@@ -315,13 +317,13 @@ REPORT_TEMPLATE = """
             </tr>
             <tr>
                 <td>CPU Utilization</td>
-                <td>{{ "%.1f" | format(system_summary.backend.avg_cpu | default(0)) }}%</td>
-                <td>{{ "%.1f" | format(system_summary.backend.max_cpu | default(0)) }}%</td>
+                <td>{{ "%.1f" | format(system_summary.backend.avg_cpu) }}%</td>
+                <td>{{ "%.1f" | format(system_summary.backend.max_cpu) }}%</td>
             </tr>
             <tr>
                 <td>Memory Utilization</td>
-                <td>{{ "%.1f" | format(system_summary.backend.avg_memory | default(0)) }}%</td>
-                <td>{{ "%.1f" | format(system_summary.backend.max_memory | default(0)) }}%</td>
+                <td>{{ "%.1f" | format(system_summary.backend.avg_memory) }}%</td>
+                <td>{{ "%.1f" | format(system_summary.backend.max_memory) }}%</td>
             </tr>
         </table>
         {% endif %}
@@ -339,10 +341,10 @@ REPORT_TEMPLATE = """
                 <th>Percentile</th>
                 <th>Response Time (ms)</th>
             </tr>
-            <tr><td>50th (Median)</td><td>{{ locust_summary.p50 | default(0) }}</td></tr>
-            <tr><td>90th</td><td>{{ locust_summary.p90 | default(0) }}</td></tr>
-            <tr><td>95th</td><td>{{ locust_summary.p95 | default(0) }}</td></tr>
-            <tr><td>99th</td><td>{{ locust_summary.p99 | default(0) }}</td></tr>
+            <tr><td>50th (Median)</td><td>{{ locust_summary.p50 }}</td></tr>
+            <tr><td>90th</td><td>{{ locust_summary.p90 }}</td></tr>
+            <tr><td>95th</td><td>{{ locust_summary.p95 }}</td></tr>
+            <tr><td>99th</td><td>{{ locust_summary.p99 }}</td></tr>
         </table>
 
         <h3>Request Summary</h3>
@@ -353,19 +355,19 @@ REPORT_TEMPLATE = """
             </tr>
             <tr>
                 <td>Total Requests</td>
-                <td>{{ locust_summary.total_requests | default(0) }}</td>
+                <td>{{ locust_summary.total_requests }}</td>
             </tr>
             <tr>
                 <td>Failed Requests</td>
-                <td>{{ locust_summary.total_failures | default(0) }}</td>
+                <td>{{ locust_summary.total_failures }}</td>
             </tr>
             <tr>
                 <td>Peak RPS</td>
-                <td>{{ "%.1f" | format(locust_summary.peak_rps | default(0)) }}</td>
+                <td>{{ "%.1f" | format(locust_summary.peak_rps) }}</td>
             </tr>
             <tr>
                 <td>Average RPS</td>
-                <td>{{ "%.1f" | format(locust_summary.avg_rps | default(0)) }}</td>
+                <td>{{ "%.1f" | format(locust_summary.avg_rps) }}</td>
             </tr>
         </table>
     </section>
@@ -375,7 +377,7 @@ REPORT_TEMPLATE = """
     {% if config %}
     <section class="card">
         <h2>Test Configuration</h2>
-        <pre style="background: #f8f9fa; padding: 15px; border-radius: 5px; overflow-x: auto;">{{ config | tojson(indent=2) }}</pre>
+        <pre style="background: #f8f9fa; padding: 15px; border-radius: 5px; overflow-x: auto;">{{ config_json }}</pre>
     </section>
     {% endif %}
 
@@ -402,16 +404,108 @@ REPORT_TEMPLATE = """
 """
 
 
+# (suffix, shift) pairs for each power-of-1024 scale
+_SIZE_UNITS = (('B', 0), ('KB', 10), ('MB', 20), ('GB', 30), ('TB', 40))
+
+
 def filesizeformat(value: int) -> str:
     """Format a file size in bytes to human readable format."""
     if value < 1024:
         return f"{value} B"
-    elif value < 1024 * 1024:
-        return f"{value / 1024:.1f} KB"
-    elif value < 1024 * 1024 * 1024:
-        return f"{value / (1024 * 1024):.1f} MB"
+    unit, shift = _SIZE_UNITS[min((int(value).bit_length() - 1) // 10, 4)]
+    return f"{value / (1 << shift):.1f} {unit}"
+
+
+def _num(sample: Dict, key: str) -> Any:
+    """Return a numeric sample field, treating missing or None as 0."""
+    value = sample.get(key)
+    return value if value is not None else 0
+
+
+_STYLE_RE = re.compile(r'<style>(.*?)</style>', re.DOTALL)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};:,])\s*')
+
+
+def _minify_css(template: str) -> str:
+    """Strip insignificant whitespace from the template's <style> block."""
+    def minify(match: re.Match) -> str:
+        css = _CSS_SPACE_RE.sub(' ', match.group(1))
+        css = _CSS_PUNCT_RE.sub(r'\1', css).replace(';}', '}')
+        return f"<style>{css.strip()}</style>"
+
+    return _STYLE_RE.sub(minify, template)
+
+
+# Markup for one bottleneck, filled in with str.format rather than a
+# template loop since there can be hundreds of them
+_BOTTLENECK_HTML = """\
+<div class="bottleneck severity-{severity}">
+            <div class="bottleneck-type">{type} - {severity}</div>
+            <div class="bottleneck-desc">{description}</div>
+            <div class="bottleneck-rec">Recommendation: {recommendation}</div>
+        </div>"""
+
+
+def _bottleneck_html(bottlenecks: List[Bottleneck]) -> str:
+    """Render the bottleneck list as a single HTML fragment."""
+    return "\n        ".join([
+        _BOTTLENECK_HTML.format(
+            severity=b.severity.value,
+            type=b.type.value,
+            description=b.description,
+            recommendation=b.recommendation
+        )
+        for b in bottlenecks
+    ])
+
+
+# Fields of each per-host-type entry in the system summary
+_HOST_SUMMARY_FIELDS = (
+    'avg_cpu', 'max_cpu', 'avg_load', 'max_load', 'avg_memory', 'max_memory'
+)
+
+
+# The report template is constant, so compile it once per process
+_ENV = Environment(
+    loader=BaseLoader(),
+    autoescape=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    # Print missing numbers as 0 rather than 'None'
+    finalize=lambda value: 0 if value is None else value
+)
+_ENV.filters['filesizeformat'] = filesizeformat
+_TEMPLATE = _ENV.from_string(_minify_css(REPORT_TEMPLATE))
+
+# Characters escaped by Jinja's tojson so JSON is safe inside HTML
+_JSON_HTML_ESCAPES = str.maketrans({
+    '<': '\\u003c',
+    '>': '\\u003e',
+    '&': '\\u0026',
+    "'": '\\u0027',
+})
+
+
+def _config_json(config: Optional[Dict]) -> str:
+    """Serialize the test config for embedding in the report.
+
+    Matches the output of Jinja's ``tojson(indent=2)`` filter, using orjson
+    when it is installed.
+    """
+    if not config:
+        return ""
+    if ORJSON_AVAILABLE:
+        text = orjson.dumps(
+            config,
+            # Stringify int/None keys as json.dumps() does
+            option=(orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+                    | orjson.OPT_NON_STR_KEYS),
+            default=str
+        ).decode('utf-8')
     else:
-        return f"{value / (1024 * 1024 * 1024):.1f} GB"
+        text = json.dumps(config, indent=2, sort_keys=True, default=str)
+    return text.translate(_JSON_HTML_ESCAPES)
 
 
 class ReportGenerator:
@@ -430,10 +524,11 @@ class ReportGenerator:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Set up Jinja2 environment
-        self.env = Environment(loader=BaseLoader())
-        self.env.filters['filesizeformat'] = filesizeformat
-        self.template = self.env.from_string(REPORT_TEMPLATE)
+        self.env = _ENV
+        self.template = _TEMPLATE
+
+        # analyze() resets the detector's findings on every call
+        self.detector = BottleneckDetector()
 
     def generate(
         self,
@@ -443,7 +538,9 @@ class ReportGenerator:
         locust_stats: Optional[List[Dict]] = None,
         config: Optional[Dict] = None,
         start_time: Optional[datetime] = None,
-        end_time: Optional[datetime] = None
+        end_time: Optional[datetime] = None,
+        compress: bool = False,
+        max_connections: Optional[int] = None
     ) -> str:
         """Generate an HTML report.
 
@@ -455,6 +552,9 @@ class ReportGenerator:
             config: Test configuration (optional)
             start_time: Test start time
             end_time: Test end time
+            compress: Write a gzip-compressed .html.gz file
+            max_connections: Peak concurrent connections, if the caller
+                already tracks it (saves a scan of haproxy_stats)
 
         Returns:
             Path to the generated report file
@@ -468,47 +568,71 @@ class ReportGenerator:
             duration = f"{minutes}m {seconds}s"
 
         # Run bottleneck analysis
-        detector = BottleneckDetector()
-        bottlenecks = detector.analyze(
+        bottlenecks = self.detector.analyze(
             haproxy_stats, system_metrics, locust_stats
         )
-        bottleneck_summary = detector.get_summary()
+        bottleneck_summary = self.detector.get_summary()
 
         # Calculate summaries
         summary = self._calculate_summary(
             haproxy_stats, system_metrics, locust_stats
         )
-        haproxy_summary = self._summarize_haproxy(haproxy_stats)
+        haproxy_summary = self._summarize_haproxy(
+            haproxy_stats, max_connections
+        )
         system_summary = self._summarize_system(system_metrics)
         locust_summary = self._summarize_locust(locust_stats)
 
-        # Get recommendations from bottlenecks
-        recommendations = list(set(b.recommendation for b in bottlenecks))
+        # Get recommendations from bottlenecks, keeping severity order
+        recommendations = list(
+            dict.fromkeys(b.recommendation for b in bottlenecks)
+        )
+
+        # Header and filename share a single clock read
+        now = datetime.utcnow()
 
         # Render template
-        html = self.template.render(
+        stream = self.template.stream(
             title=f"Performance Test Report - {run_name}",
             run_name=run_name,
             duration=duration,
-            generated_at=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
+            generated_at=now.isoformat(sep=" ", timespec="seconds") + " UTC",
             summary=summary,
             bottlenecks=bottlenecks,
             bottleneck_summary=bottleneck_summary,
+            bottleneck_html=_bottleneck_html(bottlenecks),
             haproxy_stats=haproxy_stats,
             haproxy_summary=haproxy_summary,
             system_summary=system_summary,
             locust_summary=locust_summary,
             config=config,
+            config_json=_config_json(config),
             recommendations=recommendations
         )
 
         # Write report
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = f"{now:%Y%m%d_%H%M%S}"
         filename = f"report_{run_name}_{timestamp}.html"
         filepath = self.output_dir / filename
 
-        with open(filepath, 'w') as f:
-            f.write(html)
+        if compress:
+            filepath = filepath.with_suffix('.html.gz')
+
+        # Rendered under a temporary name so a failed render leaves no
+        # truncated report behind
+        tmp_path = filepath.with_name(filepath.name + '.tmp')
+        if compress:
+            f = gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6)
+        else:
+            f = open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20)
+
+        try:
+            with f:
+                stream.dump(f)
+        except BaseException:
+            tmp_path.unlink()
+            raise
+        tmp_path.replace(filepath)
 
         logger.info(f"Report generated: {filepath}")
         return str(filepath)
@@ -531,7 +655,7 @@ class ReportGenerator:
             latest = haproxy_stats[-1] if haproxy_stats else {}
             first = haproxy_stats[0] if haproxy_stats else {}
 
-            total_req = (latest.get('stot', 0) or 0)
+            total_req = _num(latest, 'stot')
             summary['total_requests'] = total_req
 
             # Calculate RPS from time range
@@ -540,7 +664,7 @@ class ReportGenerator:
                 pass
 
             # Error rate
-            errors = latest.get('ereq', 0) or 0
+            errors = _num(latest, 'ereq')
             if total_req > 0:
                 summary['error_rate'] = (errors / total_req) * 100
 
@@ -553,33 +677,51 @@ class ReportGenerator:
 
         return summary
 
-    def _summarize_haproxy(self, stats: List[Dict]) -> Dict[str, Any]:
-        """Summarize HAProxy statistics."""
+    def _summarize_haproxy(
+        self,
+        stats: List[Dict],
+        max_connections: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Summarize HAProxy statistics.
+
+        Args:
+            stats: HAProxy statistics samples
+            max_connections: Precomputed peak scur; when omitted it is
+                found by scanning every sample
+        """
         if not stats:
             return {}
 
         latest = stats[-1]
 
         # Find max values across all samples
-        max_connections = max(s.get('scur', 0) or 0 for s in stats)
+        if max_connections is None:
+            max_connections = 0
+            for s in stats:
+                scur = _num(s, 'scur')
+                if scur > max_connections:
+                    max_connections = scur
+
+        # (class, count, percentage) rows, formatted here rather than in
+        # the template
+        total_requests = _num(latest, 'req_tot')
+        http_codes = []
+        for code in '12345':
+            count = _num(latest, f'hrsp_{code}xx')
+            pct = count / total_requests * 100 if total_requests else 0
+            http_codes.append((code, count, f"{pct:.1f}"))
 
         return {
             'max_connections': max_connections,
-            'total_connections': latest.get('stot', 0) or 0,
-            'connection_limit': latest.get('slim', 0) or 0,
+            'total_connections': _num(latest, 'stot'),
+            'connection_limit': _num(latest, 'slim'),
             'peak_utilization': (
-                (max_connections / (latest.get('slim', 1) or 1)) * 100
+                (max_connections / (_num(latest, 'slim') or 1)) * 100
             ),
-            'bytes_in': latest.get('bin', 0) or 0,
-            'bytes_out': latest.get('bout', 0) or 0,
-            'total_requests': latest.get('req_tot', 0) or 0,
-            'http_codes': {
-                '1': latest.get('hrsp_1xx', 0) or 0,
-                '2': latest.get('hrsp_2xx', 0) or 0,
-                '3': latest.get('hrsp_3xx', 0) or 0,
-                '4': latest.get('hrsp_4xx', 0) or 0,
-                '5': latest.get('hrsp_5xx', 0) or 0,
-            }
+            'bytes_in': _num(latest, 'bin'),
+            'bytes_out': _num(latest, 'bout'),
+            'total_requests': total_requests,
+            'http_codes': http_codes
         }
 
     def _summarize_system(self, metrics: List[Dict]) -> Dict[str, Any]:
@@ -587,31 +729,41 @@ class ReportGenerator:
         if not metrics:
             return {}
 
-        amphora = [m for m in metrics if 'amphora' in m.get('host_type', '')]
-        backend = [m for m in metrics if 'backend' in m.get('host_type', '')]
+        amphora = []
+        backend = []
+        for m in metrics:
+            host_type = m.get('host_type') or ''
+            # Not exclusive: a host_type naming both belongs to both
+            if 'amphora' in host_type:
+                amphora.append(m)
+            if 'backend' in host_type:
+                backend.append(m)
 
         def summarize_host_type(data: List[Dict]) -> Dict:
             if not data:
                 return {}
 
-            cpu_values = [
-                (m.get('cpu_user', 0) or 0) + (m.get('cpu_system', 0) or 0)
-                for m in data
-            ]
-            # These are ticks, not percentages, so we'll use load instead
-            load_values = [m.get('load_1', 0) or 0 for m in data]
+            # cpu_user/cpu_system are ticks, not percentages, so load
+            # average is used as the CPU proxy
+            load_values = [_num(m, 'load_1') for m in data]
+            avg_load = sum(load_values) / len(load_values)
+            max_load = max(load_values)
 
             return {
-                'avg_cpu': sum(load_values) / len(load_values) * 10 if load_values else 0,
-                'max_cpu': max(load_values) * 10 if load_values else 0,
-                'avg_load': sum(load_values) / len(load_values) if load_values else 0,
-                'max_load': max(load_values) if load_values else 0,
+                'avg_cpu': avg_load * 10,
+                'max_cpu': max_load * 10,
+                'avg_load': avg_load,
+                'max_load': max_load,
                 'avg_memory': 50,  # Placeholder
                 'max_memory': 60,  # Placeholder
             }
 
+        # The amphora table is always shown, so it needs every field
         return {
-            'amphora': summarize_host_type(amphora),
+            'amphora': (
+                summarize_host_type(amphora)
+                or dict.fromkeys(_HOST_SUMMARY_FIELDS, 0)
+            ),
             'backend': summarize_host_type(backend)
         }
 
@@ -624,7 +776,14 @@ class ReportGenerator:
 
         latest = stats[-1] if stats else {}
 
-        rps_values = [s.get('requests_per_sec', 0) or 0 for s in stats]
+        # Running sum and peak in one pass, without an intermediate list
+        rps_sum = 0
+        peak_rps = 0
+        for s in stats:
+            rps = _num(s, 'requests_per_sec')
+            rps_sum += rps
+            if rps > peak_rps:
+                peak_rps = rps
 
         return {
             'total_requests': latest.get('num_requests', 0),
@@ -633,6 +792,6 @@ class ReportGenerator:
             'p90': latest.get('p90', 0),
             'p95': latest.get('p95', 0),
             'p99': latest.get('p99', 0),
-            'peak_rps': max(rps_values) if rps_values else 0,
-            'avg_rps': sum(rps_values) / len(rps_values) if rps_values else 0
+            'peak_rps': peak_rps,
+            'avg_rps': rps_sum / len(stats)
         }
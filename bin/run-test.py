@@ -16,19 +16,23 @@ Usage:
 import argparse
 import logging
 import os
+import socket
 import subprocess
 import sys
 import threading
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import requests
 import yaml
+from requests.adapters import HTTPAdapter
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from collectors.ssh_pool import SSHConnectionPool
 from collectors.storage import MetricsStorage
 from collectors.haproxy_stats import HAProxyStatsCollector
 from collectors.amphora_api import AmphoraAPICollector
@@ -44,6 +48,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger('octavia-perf-test')
 
+# Shared HTTP session for environment checks
+_SESSION = requests.Session()
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# libyaml's C loader parses the same safe subset much faster
+_YAML_LOADER = yaml.CSafeLoader if yaml.__with_libyaml__ else yaml.SafeLoader
+
+
+def _probe_ssh(ip: str) -> bool:
+    """Return True if the host accepts TCP connections on the SSH port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(5)
+    try:
+        return sock.connect_ex((ip, 22)) == 0
+    finally:
+        sock.close()
+
 
 class TestOrchestrator:
     """Orchestrates the complete performance test workflow."""
@@ -59,6 +81,7 @@ class TestOrchestrator:
         self.storage: Optional[MetricsStorage] = None
         self.run_id: Optional[int] = None
         self.collectors: List[Any] = []
+        self.ssh_pool: Optional[SSHConnectionPool] = None
         self.scheduler: Optional[CollectionScheduler] = None
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
@@ -69,7 +92,7 @@ class TestOrchestrator:
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
 
         with open(self.config_path) as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
 
         # Set defaults
         config.setdefault('test', {})
@@ -99,29 +122,32 @@ class TestOrchestrator:
         # Check VIP reachability
         vip = self.config['locust'].get('host', '')
         if vip:
-            import requests
             try:
-                response = requests.get(vip, timeout=10)
+                response = _SESSION.get(vip, timeout=10)
                 logger.info(f"VIP {vip} is reachable (status: {response.status_code})")
             except Exception as e:
                 logger.error(f"Cannot reach VIP {vip}: {e}")
                 return False
 
-        # Check backend servers if specified
+        # Check backend servers if specified, all probes in parallel
         backends = self.config.get('collectors', {}).get('system_metrics', {}).get('backends', [])
-        for backend in backends:
-            try:
-                import socket
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(5)
-                result = sock.connect_ex((backend['ip'], 22))
-                sock.close()
-                if result == 0:
-                    logger.info(f"Backend {backend['id']} is reachable")
-                else:
-                    logger.warning(f"Backend {backend['id']} SSH not reachable")
-            except Exception as e:
-                logger.warning(f"Cannot check backend {backend.get('id')}: {e}")
+        if backends:
+            with ThreadPoolExecutor(
+                max_workers=min(16, len(backends))
+            ) as executor:
+                futures = {
+                    executor.submit(_probe_ssh, backend.get('ip')): backend
+                    for backend in backends
+                }
+                for future in as_completed(futures):
+                    backend = futures[future]
+                    try:
+                        if future.result():
+                            logger.info(f"Backend {backend['id']} is reachable")
+                        else:
+                            logger.warning(f"Backend {backend['id']} SSH not reachable")
+                    except Exception as e:
+                        logger.warning(f"Cannot check backend {backend.get('id')}: {e}")
 
         logger.info("Environment validation complete")
         return True
@@ -167,11 +193,20 @@ class TestOrchestrator:
                             data.get('raw_stats', [])
                         )
 
+                def summarize_haproxy(data):
+                    # Peak sessions across every stored row, as the
+                    # report computes it
+                    if 'error' in data:
+                        return {}
+                    scur = [s.get('scur') for s in data.get('raw_stats', [])]
+                    return {'scur': max(filter(None, scur), default=0)}
+
                 self.scheduler.add_collector(
                     name='haproxy',
                     collector=collector,
                     interval=haproxy_config.get('interval', 1),
-                    store_func=store_haproxy
+                    store_func=store_haproxy,
+                    summarize=summarize_haproxy
                 )
                 logger.info("HAProxy stats collector configured")
 
@@ -208,13 +243,19 @@ class TestOrchestrator:
         system_config = self.config.get('collectors', {}).get('system_metrics', {})
         backends = system_config.get('backends', [])
 
+        # Backends listed more than once, or under several ids, share
+        # one authenticated SSH session
+        if backends:
+            self.ssh_pool = SSHConnectionPool()
+
         for backend in backends:
             collector = SystemMetricsCollector(
                 host_ip=backend['ip'],
                 host_id=backend['id'],
                 ssh_username=backend.get('username', 'vagrant'),
                 ssh_key_path=backend.get('ssh_key'),
-                ssh_password=backend.get('password')
+                ssh_password=backend.get('password'),
+                ssh_pool=self.ssh_pool
             )
             self.collectors.append(collector)
 
@@ -269,26 +310,33 @@ class TestOrchestrator:
 
         logger.info(f"Running: {' '.join(cmd)}")
 
+        # Locust's CSV files are the data source; its console output only
+        # goes to a log file next to the reports for troubleshooting
+        output_dir = Path(self.config['report'].get('output_dir', './reports'))
+        output_dir.mkdir(parents=True, exist_ok=True)
+        log_path = output_dir / f'locust_{self.run_id}.log'
+
         try:
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            with open(log_path, 'wb') as log_file:
+                process = subprocess.Popen(
+                    cmd,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT
+                )
 
-            # Monitor progress
-            while process.poll() is None:
-                if process.stdout:
-                    line = process.stdout.readline()
-                    if line:
-                        logger.debug(f"Locust: {line.strip()}")
-                time.sleep(1)
+                try:
+                    process.wait(timeout=duration + 60)
+                except subprocess.TimeoutExpired:
+                    logger.error("Locust did not exit in time, killing it")
+                    process.kill()
+                    process.wait()
+                    return False
 
-            # Get final output
-            stdout, stderr = process.communicate()
             if process.returncode != 0:
-                logger.error(f"Locust failed: {stderr}")
+                logger.error(
+                    f"Locust failed with exit code {process.returncode}, "
+                    f"see {log_path}"
+                )
                 return False
 
             logger.info("Locust test completed successfully")
@@ -314,6 +362,11 @@ class TestOrchestrator:
         report_config = self.config.get('report', {})
         output_dir = report_config.get('output_dir', './reports')
 
+        # Peak connections were tracked while samples were stored
+        peak_scur = None
+        if self.scheduler:
+            peak_scur = self.scheduler.summary.get('scur')
+
         generator = ReportGenerator(output_dir)
         report_path = generator.generate(
             run_name=self.config['test']['name'],
@@ -322,7 +375,9 @@ class TestOrchestrator:
             locust_stats=locust_stats,
             config=self.config,
             start_time=self.start_time,
-            end_time=self.end_time
+            end_time=self.end_time,
+            compress=report_config.get('compress', False),
+            max_connections=peak_scur['max'] if peak_scur else None
         )
 
         logger.info(f"Report generated: {report_path}")
@@ -410,6 +465,12 @@ class TestOrchestrator:
                 except Exception:
                     pass
 
+            if self.ssh_pool:
+                self.ssh_pool.close_all()
+
+            if self.storage:
+                self.storage.close()
+
 
 def main():
     """Main entry point."""
@@ -1,15 +1,71 @@
 """Metrics aggregator for combining and analyzing collected data."""
 
 import logging
+import queue
 import threading
 import time
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+from .haproxy_stats import HAProxyStatsCollector
 from .storage import MetricsStorage
 
 logger = logging.getLogger(__name__)
 
+# Frontend counters summed across all listeners
+_FRONT_KEYS = (
+    'scur', 'slim', 'stot', 'bin', 'bout', 'req_tot', 'ereq', 'dreq',
+    'hrsp_2xx', 'hrsp_4xx', 'hrsp_5xx',
+)
+_get_front = itemgetter(*_FRONT_KEYS)
+
+
+def _front_values(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Frontend counters of one row in _FRONT_KEYS order.
+
+    Missing columns (older HAProxy versions or partial rows) read as None.
+    """
+    try:
+        return _get_front(row)
+    except KeyError:
+        return tuple(map(row.get, _FRONT_KEYS))
+
+
+# All aggregated HAProxy counters, in snapshot tuple order
+_ALL_KEYS = _FRONT_KEYS + ('qcur',)
+
+# Rate names for each counter, built once rather than per tick
+_RATE_KEYS = {key: f'{key}_per_sec' for key in _ALL_KEYS}
+
+
+def _snapshot_rates(
+    current: Tuple[int, ...],
+    previous: Tuple[int, ...],
+    interval_seconds: float
+) -> Dict[str, float]:
+    """Per-second rates between two counter snapshots in _ALL_KEYS order.
+
+    Counters that went backwards (reset) are skipped.
+    """
+    if interval_seconds <= 0:
+        return {}
+
+    inv_interval = 1.0 / interval_seconds
+    return {
+        rate_key: (c - p) * inv_interval
+        for rate_key, c, p in zip(_RATE_KEYS.values(), current, previous)
+        if c >= p
+    }
+
+
+_EMPTY: Dict[str, Any] = {}
+
+
+def _cpu_mem(metrics: Dict[str, Any]) -> Tuple[Any, Any]:
+    """Return a host's (cpu, memory) utilization, None where missing."""
+    utilization = metrics.get('utilization') or _EMPTY
+    return utilization.get('cpu'), utilization.get('memory')
+
 
 class MetricsAggregator:
     """Aggregates metrics from multiple collectors and calculates derived metrics.
@@ -36,9 +92,12 @@ class MetricsAggregator:
         """
         self.storage = storage
         self.run_id = run_id
-        self._prev_haproxy_stats: Optional[Dict] = None
+        self._prev_values: Optional[Tuple[int, ...]] = None
         self._prev_timestamp: Optional[float] = None
 
+        # host_id -> (is_amphora, is_backend), classified once per host
+        self._host_kinds: Dict[str, Tuple[bool, bool]] = {}
+
     def calculate_rates(
         self,
         current: Dict[str, int],
@@ -58,79 +117,80 @@ class MetricsAggregator:
         if interval_seconds <= 0:
             return {}
 
+        inv_interval = 1.0 / interval_seconds
         rates = {}
-        for key in current:
-            if key in previous:
-                delta = current[key] - previous[key]
+        for key, value in current.items():
+            prev = previous.get(key)
+            if prev is not None:
+                delta = value - prev
                 if delta >= 0:  # Handle counter resets
-                    rates[f'{key}_per_sec'] = delta / interval_seconds
+                    rate_key = _RATE_KEYS.get(key) or f'{key}_per_sec'
+                    rates[rate_key] = delta * inv_interval
 
         return rates
 
     def aggregate_haproxy_stats(
         self,
-        stats: List[Dict[str, Any]]
+        stats: Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]
     ) -> Dict[str, Any]:
         """Aggregate HAProxy statistics across all proxies.
 
         Args:
-            stats: List of raw HAProxy stats dictionaries
+            stats: HAProxy stats rows with integer counters, either as
+                returned by HAProxyStatsCollector.show_stat() or already
+                split by type as returned by get_all_stats()
 
         Returns:
-            Aggregated statistics with derived metrics
+            Aggregated statistics with derived metrics; 'timestamp' is
+            Unix time in seconds
         """
         now = time.time()
 
-        # Separate by type
-        frontends = [s for s in stats if s.get('svname') == 'FRONTEND']
-        backends = [s for s in stats if s.get('svname') == 'BACKEND']
-        servers = [s for s in stats
-                   if s.get('svname') not in ('FRONTEND', 'BACKEND')]
-
-        # Aggregate counters
-        current = {
-            'scur': sum(int(s.get('scur', 0) or 0) for s in frontends),
-            'slim': sum(int(s.get('slim', 0) or 0) for s in frontends),
-            'stot': sum(int(s.get('stot', 0) or 0) for s in frontends),
-            'bin': sum(int(s.get('bin', 0) or 0) for s in frontends),
-            'bout': sum(int(s.get('bout', 0) or 0) for s in frontends),
-            'req_tot': sum(int(s.get('req_tot', 0) or 0) for s in frontends),
-            'ereq': sum(int(s.get('ereq', 0) or 0) for s in frontends),
-            'dreq': sum(int(s.get('dreq', 0) or 0) for s in frontends),
-            'hrsp_2xx': sum(int(s.get('hrsp_2xx', 0) or 0) for s in frontends),
-            'hrsp_4xx': sum(int(s.get('hrsp_4xx', 0) or 0) for s in frontends),
-            'hrsp_5xx': sum(int(s.get('hrsp_5xx', 0) or 0) for s in frontends),
-            'qcur': sum(int(s.get('qcur', 0) or 0) for s in backends),
-        }
+        if not isinstance(stats, dict):
+            stats = HAProxyStatsCollector.classify_stats(stats)
+        frontends = stats['frontends']
+        backends = stats['backends']
+        servers = stats['servers']
 
-        # Calculate rates if we have previous data
-        rates = {}
-        if self._prev_haproxy_stats and self._prev_timestamp:
-            interval = now - self._prev_timestamp
-            rates = self.calculate_rates(
-                current, self._prev_haproxy_stats, interval
+        backend_count = len(backends)
+        qcur = sum(s.get('qcur') or 0 for s in backends)
+        total_servers = len(servers)
+        healthy_servers = sum(1 for s in servers if s.get('status') == 'UP')
+
+        # Column sums over the frontend counters, in _ALL_KEYS order
+        if frontends:
+            totals = tuple(
+                sum(v or 0 for v in column)
+                for column in zip(*map(_front_values, frontends))
+            )
+        else:
+            totals = (0,) * len(_FRONT_KEYS)
+        values = totals + (qcur,)
+        current = dict(zip(_ALL_KEYS, values))
+        frontend_count = len(frontends)
+
+        # Calculate rates once there is a previous sample to diff against
+        prev_values = self._prev_values
+        if prev_values is None or not self._prev_timestamp:
+            rates = {}
+        else:
+            rates = _snapshot_rates(
+                values, prev_values, now - self._prev_timestamp
             )
 
-        self._prev_haproxy_stats = current.copy()
+        # Tuples are immutable, so the snapshot needs no copy
+        self._prev_values = values
         self._prev_timestamp = now
 
         # Calculate derived metrics
-        saturation = 0
-        if current['slim'] > 0:
-            saturation = (current['scur'] / current['slim']) * 100
+        slim = current['slim']
+        saturation = (current['scur'] / slim) * 100 if slim > 0 else 0
 
-        error_rate = 0
-        if current['stot'] > 0:
-            error_rate = (current['ereq'] / current['stot']) * 100
-
-        # Count healthy/unhealthy servers
-        healthy_servers = sum(
-            1 for s in servers if s.get('status') == 'UP'
-        )
-        total_servers = len(servers)
+        stot = current['stot']
+        error_rate = (current['ereq'] / stot) * 100 if stot > 0 else 0
 
         return {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': now,
             'counters': current,
             'rates': rates,
             'derived': {
@@ -143,8 +203,8 @@ class MetricsAggregator:
                 'throughput_out_bps': rates.get('bout_per_sec', 0),
             },
             'summary': {
-                'frontend_count': len(frontends),
-                'backend_count': len(backends),
+                'frontend_count': frontend_count,
+                'backend_count': backend_count,
                 'server_count': total_servers,
             }
         }
@@ -159,64 +219,57 @@ class MetricsAggregator:
             metrics: Dictionary mapping host_id to metrics
 
         Returns:
-            Aggregated system metrics
+            Aggregated system metrics; 'timestamp' is Unix time in seconds
         """
-        amphora_metrics = {
-            k: v for k, v in metrics.items()
-            if 'amphora' in k.lower() or 'amp' in k.lower()
-        }
-        backend_metrics = {
-            k: v for k, v in metrics.items()
-            if 'backend' in k.lower()
-        }
-
-        # Average CPU utilization across amphorae
-        amphora_cpu_avg = 0
-        amphora_mem_avg = 0
-        if amphora_metrics:
-            cpu_values = [
-                m.get('utilization', {}).get('cpu', 0)
-                for m in amphora_metrics.values()
-                if m.get('utilization', {}).get('cpu') is not None
-            ]
-            mem_values = [
-                m.get('utilization', {}).get('memory', 0)
-                for m in amphora_metrics.values()
-                if m.get('utilization', {}).get('memory') is not None
-            ]
-            if cpu_values:
-                amphora_cpu_avg = sum(cpu_values) / len(cpu_values)
-            if mem_values:
-                amphora_mem_avg = sum(mem_values) / len(mem_values)
-
-        # Average metrics across backends
-        backend_cpu_avg = 0
-        backend_mem_avg = 0
-        if backend_metrics:
-            cpu_values = [
-                m.get('utilization', {}).get('cpu', 0)
-                for m in backend_metrics.values()
-                if m.get('utilization', {}).get('cpu') is not None
-            ]
-            mem_values = [
-                m.get('utilization', {}).get('memory', 0)
-                for m in backend_metrics.values()
-                if m.get('utilization', {}).get('memory') is not None
-            ]
-            if cpu_values:
-                backend_cpu_avg = sum(cpu_values) / len(cpu_values)
-            if mem_values:
-                backend_mem_avg = sum(mem_values) / len(mem_values)
+        host_kinds = self._host_kinds
+        amphora_count = backend_count = 0
+        amphora_cpu = amphora_mem = backend_cpu = backend_mem = 0
+        amphora_cpu_n = amphora_mem_n = backend_cpu_n = backend_mem_n = 0
+
+        # Partition hosts and accumulate utilization in a single pass
+        for host_id, m in metrics.items():
+            kind = host_kinds.get(host_id)
+            if kind is None:
+                lowered = host_id.lower()
+                kind = host_kinds[host_id] = (
+                    'amp' in lowered, 'backend' in lowered
+                )
+            is_amphora, is_backend = kind
+            if not (is_amphora or is_backend):
+                continue
+
+            cpu, mem = _cpu_mem(m)
+            if is_amphora:
+                amphora_count += 1
+                if cpu is not None:
+                    amphora_cpu += cpu
+                    amphora_cpu_n += 1
+                if mem is not None:
+                    amphora_mem += mem
+                    amphora_mem_n += 1
+            if is_backend:
+                backend_count += 1
+                if cpu is not None:
+                    backend_cpu += cpu
+                    backend_cpu_n += 1
+                if mem is not None:
+                    backend_mem += mem
+                    backend_mem_n += 1
+
+        amphora_cpu_avg = amphora_cpu / amphora_cpu_n if amphora_cpu_n else 0
+        amphora_mem_avg = amphora_mem / amphora_mem_n if amphora_mem_n else 0
+        backend_cpu_avg = backend_cpu / backend_cpu_n if backend_cpu_n else 0
+        backend_mem_avg = backend_mem / backend_mem_n if backend_mem_n else 0
 
         return {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': time.time(),
             'amphora': {
-                'count': len(amphora_metrics),
+                'count': amphora_count,
                 'avg_cpu_utilization': amphora_cpu_avg,
                 'avg_memory_utilization': amphora_mem_avg,
             },
             'backend': {
-                'count': len(backend_metrics),
+                'count': backend_count,
                 'avg_cpu_utilization': backend_cpu_avg,
                 'avg_memory_utilization': backend_mem_avg,
             },
@@ -224,8 +277,67 @@ class MetricsAggregator:
         }
 
 
+class RunSummary:
+    """Running min/max/sum/count per metric for a test run.
+
+    Updated as samples are written, so end-of-run summaries don't need
+    to re-read the full time series from storage.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, values: Dict[str, float]):
+        """Fold one sample's metric values into the running aggregates."""
+        with self._lock:
+            for name, value in values.items():
+                if value is None:
+                    continue
+                acc = self._metrics.get(name)
+                if acc is None:
+                    self._metrics[name] = [value, value, value, 1]
+                    continue
+                if value < acc[0]:
+                    acc[0] = value
+                if value > acc[1]:
+                    acc[1] = value
+                acc[2] += value
+                acc[3] += 1
+
+    def get(self, name: str) -> Optional[Dict[str, float]]:
+        """Get the aggregates for a metric, or None if never seen.
+
+        Returns:
+            Dictionary with min, max, sum, count and avg
+        """
+        with self._lock:
+            acc = self._metrics.get(name)
+            if acc is None:
+                return None
+            low, high, total, count = acc
+        return {
+            'min': low,
+            'max': high,
+            'sum': total,
+            'count': count,
+            'avg': total / count
+        }
+
+
 class CollectionScheduler:
-    """Schedules periodic metric collection from multiple sources."""
+    """Schedules periodic metric collection from multiple sources.
+
+    Each collector runs in its own thread, so a slow host does not hold
+    up the others.
+
+    Collected data is handed to a writer thread, which applies up to
+    WRITE_BATCH_SIZE store_func calls per storage transaction and folds
+    each sample into ``summary``.
+    """
+
+    WRITE_QUEUE_SIZE = 1024
+    WRITE_BATCH_SIZE = 128
 
     def __init__(
         self,
@@ -241,16 +353,22 @@ class CollectionScheduler:
         self.storage = storage
         self.run_id = run_id
         self.aggregator = MetricsAggregator(storage, run_id)
+        self.summary = RunSummary()
         self._collectors: Dict[str, Dict] = {}
         self._stop_event = threading.Event()
         self._threads: List[threading.Thread] = []
 
+        # Collected samples waiting to be written by the writer thread
+        self._write_q: queue.Queue = queue.Queue(maxsize=self.WRITE_QUEUE_SIZE)
+        self._writer_thread: Optional[threading.Thread] = None
+
     def add_collector(
         self,
         name: str,
         collector: Any,
         interval: float,
-        store_func: Callable[[Any], None]
+        store_func: Callable[[Any], None],
+        summarize: Optional[Callable[[Any], Dict[str, float]]] = None
     ):
         """Add a collector to the scheduler.
 
@@ -259,40 +377,90 @@ class CollectionScheduler:
             collector: Collector object with a collect() method
             interval: Collection interval in seconds
             store_func: Function to call with collected data
+            summarize: Function returning metric values from collected
+                data to fold into ``summary`` (optional)
         """
         self._collectors[name] = {
             'collector': collector,
             'interval': interval,
-            'store_func': store_func
+            'store_func': store_func,
+            'summarize': summarize
         }
 
     def _collection_loop(self, name: str, config: Dict):
-        """Collection loop for a single collector."""
+        """Collection loop for a single collector.
+
+        Collections are scheduled on fixed monotonic-clock deadlines, so
+        the interval does not drift with collection time or wall-clock
+        adjustments.
+        """
         collector = config['collector']
         interval = config['interval']
         store_func = config['store_func']
+        summarize = config['summarize']
 
+        deadline = time.monotonic()
         while not self._stop_event.is_set():
+            deadline += interval
             try:
-                start_time = time.time()
-
                 # Collect metrics
                 data = collector.collect()
 
-                # Store the data
-                store_func(data)
-
-                # Sleep for remaining interval time
-                elapsed = time.time() - start_time
-                sleep_time = max(0, interval - elapsed)
-                self._stop_event.wait(sleep_time)
+                # Queue the data for the writer thread
+                try:
+                    self._write_q.put_nowait((store_func, summarize, data))
+                except queue.Full:
+                    logger.warning(f"Write queue full, dropping {name} sample")
 
             except Exception as e:
                 logger.error(f"Collection error in {name}: {e}")
-                self._stop_event.wait(interval)
+                deadline = time.monotonic() + interval
+
+            # Sleep until the next deadline; after an overrun, start the
+            # next collection now rather than bursting to catch up
+            now = time.monotonic()
+            if deadline < now:
+                deadline = now
+            if self._stop_event.wait(deadline - now):
+                break
+
+    def _writer_loop(self):
+        """Apply queued store_func calls in batched transactions."""
+        summary = self.summary
+        stopping = False
+        while not stopping:
+            batch = [self._write_q.get()]
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._write_q.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                with self.storage.batch():
+                    for item in batch:
+                        if item is None:
+                            stopping = True
+                            continue
+                        store_func, summarize, data = item
+                        try:
+                            store_func(data)
+                            if summarize is not None:
+                                summary.update(summarize(data))
+                        except Exception as e:
+                            logger.error(f"Failed to store metrics: {e}")
+            except Exception as e:
+                logger.error(f"Failed to write metrics batch: {e}")
 
     def start(self):
-        """Start all collection threads."""
+        """Start the writer thread and all collection threads."""
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            name="metrics-writer",
+            daemon=True
+        )
+        self._writer_thread.start()
+
         self._stop_event.clear()
 
         for name, config in self._collectors.items():
@@ -312,6 +480,9 @@ class CollectionScheduler:
         Args:
             timeout: Maximum time to wait for threads to stop
         """
+        if self._writer_thread is None:
+            return
+
         self._stop_event.set()
 
         for thread in self._threads:
@@ -320,6 +491,14 @@ class CollectionScheduler:
                 logger.warning(f"Thread {thread.name} did not stop cleanly")
 
         self._threads.clear()
+
+        # Flush everything already queued, then stop the writer
+        self._write_q.put(None)
+        self._writer_thread.join(timeout=timeout)
+        if self._writer_thread.is_alive():
+            logger.warning("Metrics writer did not finish flushing")
+        self._writer_thread = None
+
         logger.info("All collectors stopped")
 
     def __enter__(self):
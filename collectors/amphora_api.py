@@ -1,15 +1,135 @@
 """Amphora REST API collector for system metrics."""
 
 import logging
+import ssl
+import threading
+import time
+from concurrent.futures import Future
 from typing import Any, Dict, Optional
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+class _LoggingRetry(Retry):
+    """Retry policy that logs each retry so slow amphorae are visible."""
+
+    def increment(self, method=None, url=None, response=None, error=None,
+                  *args, **kwargs):
+        # Raises MaxRetryError once retries are exhausted
+        retry = super().increment(
+            method, url, response, error, *args, **kwargs
+        )
+        reason = error or (response.status if response is not None else None)
+        logger.warning(f"Retrying {method} {url}: {reason}")
+        return retry
+
+
+class _SSLContextAdapter(HTTPAdapter):
+    """HTTPAdapter that connects with one prebuilt SSLContext.
+
+    The CA bundle and client certificate are loaded into the context once,
+    instead of being handed to urllib3 as paths and reloaded on every new
+    connection.
+    """
+
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs):
+        # Set before super().__init__(), which calls init_poolmanager()
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = self._ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs['ssl_context'] = self._ssl_context
+        return super().proxy_manager_for(*args, **kwargs)
+
+    def cert_verify(self, conn, url, verify, cert):
+        # Certificates already live in the context
+        pass
+
+
+def create_session(
+    client_cert_path: Optional[str] = None,
+    client_key_path: Optional[str] = None,
+    server_ca_path: Optional[str] = None,
+    verify_ssl: bool = True,
+    pool_connections: int = 1,
+    pool_maxsize: int = 4,
+    retry_total: int = 1,
+    retry_backoff: float = 0.1
+) -> requests.Session:
+    """Create a keep-alive HTTPS session for the amphora API.
+
+    Each AmphoraAPICollector builds its own session by default. When one
+    process polls many amphorae, create a session here with a larger
+    pool_connections (one pool per host) and pass it to every collector.
+
+    Args:
+        client_cert_path: Path to client certificate for mTLS
+        client_key_path: Path to client key (if separate from cert)
+        server_ca_path: Path to CA cert to verify amphora server
+        verify_ssl: Whether to verify SSL certificates
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Connections kept open per host
+        retry_total: Retries for GET/HEAD on connection errors and
+            502/503/504 responses
+        retry_backoff: Backoff factor between retries, in seconds
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    session.headers['Connection'] = 'keep-alive'
+
+    # Fail fast: a stuck amphora should not stall the collection cycle,
+    # the next poll is the real retry
+    retry_strategy = _LoggingRetry(
+        total=retry_total,
+        backoff_factor=retry_backoff,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=True,
+        respect_retry_after_header=False
+    )
+    adapter_kwargs = {
+        'pool_connections': pool_connections,
+        'pool_maxsize': pool_maxsize,
+        'max_retries': retry_strategy,
+        'pool_block': False,
+    }
+
+    if not (client_cert_path or server_ca_path or not verify_ssl):
+        session.mount("https://", HTTPAdapter(**adapter_kwargs))
+        return session
+
+    # Build the TLS context once so every connection shares it
+    context = ssl.create_default_context(cafile=server_ca_path)
+    if not verify_ssl:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        session.verify = False
+        # Disable SSL warnings when verification is off
+        import urllib3
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    if client_cert_path:
+        context.load_cert_chain(client_cert_path, client_key_path)
+
+    session.mount("https://", _SSLContextAdapter(context, **adapter_kwargs))
+    return session
+
+
 class AmphoraAPICollector:
     """Collects system metrics from the Amphora REST API.
 
@@ -37,6 +157,7 @@ class AmphoraAPICollector:
 
     DEFAULT_PORT = 9443
     DEFAULT_TIMEOUT = 10
+    DEFAULT_DETAILS_TTL = 1.0
 
     def __init__(
         self,
@@ -46,7 +167,11 @@ class AmphoraAPICollector:
         server_ca_path: Optional[str] = None,
         port: int = DEFAULT_PORT,
         timeout: int = DEFAULT_TIMEOUT,
-        verify_ssl: bool = True
+        verify_ssl: bool = True,
+        details_ttl: float = DEFAULT_DETAILS_TTL,
+        session: Optional[requests.Session] = None,
+        retry_total: int = 1,
+        retry_backoff: float = 0.1
     ):
         """Initialize the Amphora API collector.
 
@@ -58,39 +183,39 @@ class AmphoraAPICollector:
             port: API port (default 9443)
             timeout: Request timeout in seconds
             verify_ssl: Whether to verify SSL certificates
+            details_ttl: Seconds a /1.0/details response is reused by
+                get_details() and the metric getters (0 disables)
+            session: Shared session from create_session(); the TLS options
+                above are ignored when given and the caller owns its lifetime
+            retry_total: Retries per request (own session only)
+            retry_backoff: Retry backoff factor (own session only)
         """
         self.amphora_ip = amphora_ip
         self.port = port
         self.timeout = timeout
         self.base_url = f"https://{amphora_ip}:{port}"
 
-        # Configure session with TLS
-        self.session = requests.Session()
-
-        # Set up client certificate if provided
-        if client_cert_path:
-            if client_key_path:
-                self.session.cert = (client_cert_path, client_key_path)
-            else:
-                self.session.cert = client_cert_path
-
-        # Set up server verification
-        if verify_ssl and server_ca_path:
-            self.session.verify = server_ca_path
-        elif not verify_ssl:
-            self.session.verify = False
-            # Disable SSL warnings when verification is off
-            import urllib3
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-        # Set up retries
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=0.5,
-            status_forcelist=[500, 502, 503, 504]
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
+        # Last /1.0/details response, shared by the get_*_metrics helpers
+        self._details_ttl = details_ttl
+        self._details_cache: Optional[Dict[str, Any]] = None
+        self._details_cache_ts = 0.0
+        # Fetch that concurrent get_details() callers wait on
+        self._details_inflight: Optional[Future] = None
+        self._inflight_lock = threading.Lock()
+
+        if session is None:
+            session = create_session(
+                client_cert_path=client_cert_path,
+                client_key_path=client_key_path,
+                server_ca_path=server_ca_path,
+                verify_ssl=verify_ssl,
+                retry_total=retry_total,
+                retry_backoff=retry_backoff
+            )
+            self._owns_session = True
+        else:
+            self._owns_session = False
+        self.session = session
 
     def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
         """Make an API request.
@@ -109,8 +234,10 @@ class AmphoraAPICollector:
         try:
             response = self.session.request(method, url, **kwargs)
             response.raise_for_status()
+            if ORJSON_AVAILABLE:
+                return orjson.loads(response.content)
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"API request failed: {e}")
             raise
 
@@ -138,8 +265,42 @@ class AmphoraAPICollector:
             - load: [1min, 5min, 15min]
             - topology: str
             - listeners: list
+
+            A response less than ``details_ttl`` seconds old is reused,
+            and concurrent callers share a single in-flight request.
+            Treat it as read-only.
         """
-        return self._request('GET', '/1.0/details')
+        now = time.monotonic()
+        if (self._details_cache is not None
+                and now - self._details_cache_ts < self._details_ttl):
+            return self._details_cache
+
+        # Only one thread fetches; concurrent callers share its result
+        with self._inflight_lock:
+            future = self._details_inflight
+            leader = future is None
+            if leader:
+                future = self._details_inflight = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            details = self._request('GET', '/1.0/details')
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._details_cache = details
+            self._details_cache_ts = now
+            future.set_result(details)
+            return details
+        finally:
+            with self._inflight_lock:
+                self._details_inflight = None
+
+    def invalidate_details(self):
+        """Force the next get_details() call to query the amphora."""
+        self._details_cache = None
 
     def get_listeners(self) -> Dict[str, Any]:
         """Get list of listeners on the amphora.
@@ -226,8 +387,11 @@ class AmphoraAPICollector:
             - memory_utilization: Memory usage %
             - disk_utilization: Disk usage %
         """
-        details = self.get_details()
+        return self._utilization_from(self.get_details())
 
+    @staticmethod
+    def _utilization_from(details: Dict[str, Any]) -> Dict[str, float]:
+        """Calculate utilization percentages from a details response."""
         # CPU utilization estimate (load average / cpu_count)
         cpu_count = details.get('cpu_count', 1)
         load = details.get('load', [0])
@@ -265,7 +429,7 @@ class AmphoraAPICollector:
         """
         try:
             details = self.get_details()
-            utilization = self.get_utilization()
+            utilization = self._utilization_from(details)
 
             return {
                 'hostname': details.get('hostname'),
@@ -287,15 +451,23 @@ class AmphoraAPICollector:
             logger.error(f"Failed to collect amphora metrics: {e}")
             return {'error': str(e)}
 
-    def is_healthy(self) -> bool:
+    def is_healthy(self, deep: bool = False) -> bool:
         """Check if amphora is healthy.
 
+        The default check only fetches the small /1.0/info payload; a
+        successful response means the agent is up and answering.
+
+        Args:
+            deep: Fetch /1.0/details and also require its 'active' flag
+
         Returns:
-            True if amphora is reachable and active
+            True if amphora is reachable (and active, for a deep check)
         """
         try:
-            details = self.get_details()
-            return details.get('active', False)
+            if deep:
+                return bool(self.get_details().get('active', False))
+            self.get_info()
+            return True
         except Exception:
             return False
 
@@ -305,5 +477,6 @@ class AmphoraAPICollector:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self.session.close()
+        if self._owns_session:
+            self.session.close()
         return False
@@ -0,0 +1,57 @@
+"""Short-lived cache for collector query results."""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class MetricsCache:
+    """Thread-safe TTL cache for collector query results.
+
+    Lets a collector reuse results that change slowly, such as
+    SystemMetricsCollector's disk usage, for the TTL instead of querying
+    them again on every tick. Keys are any hashable value chosen by the
+    collector.
+    """
+
+    def __init__(self, ttl: float = 2.0):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid
+        """
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, ttl: Optional[float] = None) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or stale.
+
+        Args:
+            key: Cache key
+            ttl: Maximum age to accept, overriding the cache default
+
+        Returns:
+            Cached value or None
+        """
+        max_age = self.ttl if ttl is None else ttl
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if time.monotonic() - stored_at < max_age:
+            return value
+        return None
+
+    def set(self, key: Hashable, value: Any):
+        """Store value under key, stamped with the current time."""
+        entry = (time.monotonic(), value)
+        with self._lock:
+            self._entries[key] = entry
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
@@ -1,14 +1,26 @@
 """HAProxy statistics collector via SSH and stats socket."""
 
 import csv
-import io
 import logging
-from typing import Any, Dict, List, Optional
+import sys
+import threading
+import time
+from operator import itemgetter
+from typing import (
+    Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+)
 
 import paramiko
 
 logger = logging.getLogger(__name__)
 
+# show_stat() rows, or the grouped dict returned by classify_stats()
+StatsArg = Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]
+
+# Every show_stat() row has an svname column
+_svname = itemgetter('svname')
+_PROXY_SVNAMES = frozenset(('FRONTEND', 'BACKEND'))
+
 
 class HAProxyStatsCollector:
     """Collects metrics from HAProxy stats socket via SSH.
@@ -45,6 +57,51 @@ class HAProxyStatsCollector:
     # HAProxy socket path (from Octavia constants)
     SOCKET_PATH_TEMPLATE = "/var/lib/octavia/{lb_id}.sock"
 
+    # Queries behind collect(), sent to the stats socket together
+    COLLECT_QUERIES = ('show info', 'show stat -1 -1 -1')
+
+    # Seconds to wait on a persistent stats channel before giving up on it
+    CHANNEL_TIMEOUT = 30
+
+    # Idle timeout set on persistent stats channels with 'set timeout cli'.
+    # Without it HAProxy drops them after the stats socket timeout (10s by
+    # default), which is shorter than many collection intervals.
+    CLI_TIMEOUT = 300
+
+    # Idle channels older than this are closed and reopened rather than
+    # reused, so a query never lands on one HAProxy is about to drop
+    CHANNEL_MAX_IDLE = 240
+
+    # Printed by the stats socket after each response in interactive mode
+    _PROMPT = b'\n> '
+
+    # Numeric columns converted to int when the CSV is parsed. Cells that
+    # don't apply to a row type are empty and become None.
+    COUNTER_FIELDS = (
+        'qcur', 'qmax', 'scur', 'smax', 'slim', 'stot', 'bin', 'bout',
+        'dreq', 'dresp', 'ereq', 'econ', 'eresp', 'wretr', 'wredis',
+        'weight', 'act', 'bck', 'chkfail', 'chkdown', 'downtime', 'lbtot',
+        'rate', 'rate_lim', 'rate_max', 'hrsp_1xx', 'hrsp_2xx', 'hrsp_3xx',
+        'hrsp_4xx', 'hrsp_5xx', 'hrsp_other', 'req_rate', 'req_rate_max',
+        'req_tot', 'cli_abrt', 'srv_abrt',
+    )
+    _COUNTER_SET = frozenset(COUNTER_FIELDS)
+
+    # Counters summed by _aggregate(), per row type; any svname other than
+    # FRONTEND/BACKEND is a server row
+    _SERVER_TOTAL_FIELDS = ('srv_abrt', 'econ', 'eresp')
+    _TOTAL_FIELDS = {
+        'FRONTEND': (
+            'scur', 'slim', 'stot', 'bin', 'bout', 'req_tot', 'ereq', 'dreq',
+            'hrsp_1xx', 'hrsp_2xx', 'hrsp_3xx', 'hrsp_4xx', 'hrsp_5xx',
+        ),
+        'BACKEND': ('cli_abrt',),
+    }
+    _ALL_TOTAL_FIELDS = (
+        _TOTAL_FIELDS['FRONTEND'] + _TOTAL_FIELDS['BACKEND']
+        + _SERVER_TOTAL_FIELDS
+    )
+
     def __init__(
         self,
         amphora_ip: str,
@@ -73,6 +130,11 @@ class HAProxyStatsCollector:
         self.ssh_port = ssh_port
         self._ssh_client: Optional[paramiko.SSHClient] = None
 
+        # Idle interactive socat channels, reused across queries, with
+        # the monotonic time each was last used
+        self._channels: List[Tuple[paramiko.Channel, float]] = []
+        self._channels_lock = threading.Lock()
+
     def connect(self):
         """Establish SSH connection to amphora."""
         if self._ssh_client is not None:
@@ -102,18 +164,35 @@ class HAProxyStatsCollector:
 
     def disconnect(self):
         """Close SSH connection."""
+        with self._channels_lock:
+            channels, self._channels = self._channels, []
+        for channel, _ in channels:
+            channel.close()
         if self._ssh_client:
             self._ssh_client.close()
             self._ssh_client = None
             logger.info(f"Disconnected from amphora {self.amphora_ip}")
 
-    def _execute_command(self, command: str) -> str:
-        """Execute a command via SSH and return output."""
+    def _execute_command(
+        self,
+        command: str,
+        input_data: Optional[str] = None
+    ) -> str:
+        """Execute a command via SSH and return output.
+
+        Args:
+            command: Command line to run on the amphora
+            input_data: Text written to the command's stdin, followed by EOF
+        """
         if self._ssh_client is None:
             self.connect()
 
         try:
             stdin, stdout, stderr = self._ssh_client.exec_command(command)
+            if input_data is not None:
+                stdin.write(input_data)
+                stdin.flush()
+                stdin.channel.shutdown_write()
             output = stdout.read().decode('utf-8')
             error = stderr.read().decode('utf-8')
 
@@ -125,6 +204,60 @@ class HAProxyStatsCollector:
             logger.error(f"Command execution failed: {e}")
             raise
 
+    def _open_channel(self) -> paramiko.Channel:
+        """Open a socat session on the stats socket in interactive mode.
+
+        The session's CLI timeout is raised to CLI_TIMEOUT so it survives
+        between collections.
+        """
+        if self._ssh_client is None:
+            self.connect()
+
+        channel = self._ssh_client.get_transport().open_session()
+        channel.settimeout(self.CHANNEL_TIMEOUT)
+        try:
+            channel.exec_command(
+                f'sudo socat unix-connect:{self.socket_path} stdio'
+            )
+            channel.sendall(
+                f'prompt\nset timeout cli {self.CLI_TIMEOUT}\n'.encode()
+            )
+            self._read_responses(channel, 2)
+        except Exception:
+            channel.close()
+            raise
+        return channel
+
+    def _read_responses(
+        self,
+        channel: paramiko.Channel,
+        count: int
+    ) -> List[str]:
+        """Read count pipelined interactive-mode responses.
+
+        Each response ends at a prompt at the start of a line; data after
+        it belongs to the next response.
+        """
+        buf = bytearray()
+        responses = []
+        start = 0
+        while len(responses) < count:
+            if buf.startswith(b'> ', start):
+                end = start
+            else:
+                end = buf.find(self._PROMPT, start)
+                if end >= 0:
+                    end += 1
+            if end < 0:
+                data = channel.recv(65536)
+                if not data:
+                    raise EOFError("HAProxy stats channel closed")
+                buf += data
+                continue
+            responses.append(buf[start:end].decode('utf-8'))
+            start = end + 2
+        return responses
+
     def _query_socket(self, query: str) -> str:
         """Query the HAProxy stats socket.
 
@@ -134,9 +267,57 @@ class HAProxyStatsCollector:
         Returns:
             Raw output from HAProxy
         """
-        # Use socat to query the Unix socket
-        command = f'echo "{query}" | sudo socat unix-connect:{self.socket_path} stdio'
-        return self._execute_command(command)
+        return self._query_socket_multi([query])[0]
+
+    def _query_socket_multi(self, queries: List[str]) -> List[str]:
+        """Query the HAProxy stats socket with several commands at once.
+
+        Queries go over a persistent interactive socat channel, so each
+        batch costs a single round-trip instead of a new SSH channel and
+        process. If the channel fails, the batch falls back to a one-shot
+        socat run.
+
+        Args:
+            queries: HAProxy commands
+
+        Returns:
+            Raw output from HAProxy for each query, in order
+        """
+        with self._channels_lock:
+            channel, last_used = (
+                self._channels.pop() if self._channels else (None, 0)
+            )
+        if (channel is not None
+                and time.monotonic() - last_used > self.CHANNEL_MAX_IDLE):
+            channel.close()
+            channel = None
+
+        try:
+            if channel is None:
+                channel = self._open_channel()
+            channel.sendall(
+                ''.join(f'{query}\n' for query in queries).encode('utf-8')
+            )
+            outputs = self._read_responses(channel, len(queries))
+        except (OSError, EOFError, paramiko.SSHException) as e:
+            logger.debug(f"Stats channel failed, using one-shot query: {e}")
+            if channel is not None:
+                channel.close()
+        else:
+            with self._channels_lock:
+                self._channels.append((channel, time.monotonic()))
+            return outputs
+
+        # One-shot socat; the queries go in on stdin rather than through
+        # a shell echo pipeline. In this mode HAProxy runs ';'-separated
+        # commands in order and ends each response with a blank line.
+        output = self._execute_command(
+            f'sudo socat stdio unix-connect:{self.socket_path}',
+            input_data=';'.join(queries) + '\n'
+        )
+        outputs = output.split('\n\n', len(queries) - 1)
+        outputs += [''] * (len(queries) - len(outputs))
+        return outputs
 
     def show_info(self) -> Dict[str, str]:
         """Get HAProxy process information.
@@ -144,7 +325,11 @@ class HAProxyStatsCollector:
         Returns:
             Dictionary with HAProxy info (version, uptime, connections, etc.)
         """
-        output = self._query_socket('show info')
+        return self._parse_info(self._query_socket('show info'))
+
+    @staticmethod
+    def _parse_info(output: str) -> Dict[str, str]:
+        """Parse 'show info' output into a dict."""
         result = {}
 
         for line in output.strip().split('\n'):
@@ -173,148 +358,312 @@ class HAProxyStatsCollector:
         query = f'show stat {proxy_iid} {object_type} {server_id}'
         output = self._query_socket(query)
 
-        # HAProxy CSV output starts with '# ' header
-        if output.startswith('# '):
-            output = output[2:]
+        return self._parse_stats(output)
 
-        # Parse CSV
-        reader = csv.DictReader(io.StringIO(output))
-        stats = list(reader)
+    @classmethod
+    def _parse_stats(cls, output: str) -> List[Dict[str, Any]]:
+        """Parse 'show stat' CSV output into a list of row dicts."""
+        return list(cls._iter_stats(output))
 
-        # Filter out internal prometheus proxy stats
-        stats = [s for s in stats if 'prometheus' not in s.get('pxname', '')]
+    @classmethod
+    def _iter_stats(cls, output: str) -> Iterator[Dict[str, Any]]:
+        """Yield one dict per 'show stat' CSV row.
 
-        return stats
+        Rows are read as plain lists and fixed up by column index before
+        becoming dicts, which is much cheaper than csv.DictReader plus
+        per-key lookups.
+        """
+        lines = output.splitlines()
+        # HAProxy CSV output starts with '# ' header
+        if lines and lines[0].startswith('# '):
+            lines[0] = lines[0][2:]
 
-    def get_frontend_stats(self) -> List[Dict[str, Any]]:
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if not header:
+            return
+        width = len(header)
+        pxname_idx = header.index('pxname') if 'pxname' in header else None
+        svname_idx = header.index('svname') if 'svname' in header else None
+        counter_idx = [i for i, name in enumerate(header)
+                       if name in cls._COUNTER_SET]
+        intern = sys.intern
+
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row.extend([None] * (width - len(row)))
+
+            # Filter out internal prometheus proxy stats
+            if pxname_idx is not None and 'prometheus' in row[pxname_idx]:
+                continue
+
+            # Convert counters once here; empty cells become None, as
+            # storage's _int_or_none treats them. svname is interned so
+            # FRONTEND/BACKEND checks against literals match by
+            # identity, and repeated member names share one string.
+            if svname_idx is not None and row[svname_idx]:
+                row[svname_idx] = intern(row[svname_idx])
+            for i in counter_idx:
+                value = row[i]
+                row[i] = int(value) if value else None
+
+            yield dict(zip(header, row))
+
+    def get_frontend_stats(
+        self,
+        stats: Optional[StatsArg] = None
+    ) -> List[Dict[str, Any]]:
         """Get frontend (listener) statistics.
 
+        Args:
+            stats: Rows already fetched with show_stat(), or their
+                classify_stats() result; queried when omitted
+
         Returns:
             List of frontend stats dictionaries
         """
+        if stats is not None:
+            return self._classified(stats)['frontends']
         stats = self.show_stat(object_type=1)  # 1 = frontends
-        return [s for s in stats if s.get('svname') == 'FRONTEND']
+        return [s for s in stats if _svname(s) == 'FRONTEND']
 
-    def get_backend_stats(self) -> List[Dict[str, Any]]:
+    def get_backend_stats(
+        self,
+        stats: Optional[StatsArg] = None
+    ) -> List[Dict[str, Any]]:
         """Get backend (pool) statistics.
 
+        Args:
+            stats: Pre-fetched rows, as for get_frontend_stats()
+
         Returns:
             List of backend stats dictionaries
         """
+        if stats is not None:
+            return self._classified(stats)['backends']
         stats = self.show_stat(object_type=2)  # 2 = backends
-        return [s for s in stats if s.get('svname') == 'BACKEND']
+        return [s for s in stats if _svname(s) == 'BACKEND']
 
-    def get_server_stats(self) -> List[Dict[str, Any]]:
+    def get_server_stats(
+        self,
+        stats: Optional[StatsArg] = None
+    ) -> List[Dict[str, Any]]:
         """Get server (member) statistics.
 
+        Args:
+            stats: Pre-fetched rows, as for get_frontend_stats()
+
         Returns:
             List of server stats dictionaries
         """
+        if stats is not None:
+            return self._classified(stats)['servers']
         stats = self.show_stat(object_type=4)  # 4 = servers
-        return [s for s in stats
-                if s.get('svname') not in ('FRONTEND', 'BACKEND')]
+        return [s for s in stats if _svname(s) not in _PROXY_SVNAMES]
 
-    def get_all_stats(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Get all statistics organized by type.
+    @staticmethod
+    def classify_stats(
+        stats: List[Dict[str, Any]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Split 'show stat' rows by type in a single pass.
+
+        Args:
+            stats: Rows as returned by show_stat()
 
         Returns:
             Dictionary with 'frontends', 'backends', and 'servers' keys
         """
-        all_stats = self.show_stat()
+        frontends = []
+        backends = []
+        servers = []
+        append_to = {
+            'FRONTEND': frontends.append,
+            'BACKEND': backends.append,
+        }.get
+        add_server = servers.append
+
+        for s in stats:
+            append_to(_svname(s), add_server)(s)
 
         return {
-            'frontends': [s for s in all_stats
-                          if s.get('svname') == 'FRONTEND'],
-            'backends': [s for s in all_stats
-                         if s.get('svname') == 'BACKEND'],
-            'servers': [s for s in all_stats
-                        if s.get('svname') not in ('FRONTEND', 'BACKEND')]
+            'frontends': frontends,
+            'backends': backends,
+            'servers': servers
         }
 
-    def get_connection_stats(self) -> Dict[str, Any]:
+    def get_all_stats(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Get all statistics organized by type.
+
+        Returns:
+            Dictionary with 'frontends', 'backends', and 'servers' keys
+        """
+        return self.classify_stats(self.show_stat())
+
+    def _classified(self, stats: StatsArg) -> Dict[str, List[Dict[str, Any]]]:
+        """Return stats grouped by type, classifying raw rows if needed."""
+        if isinstance(stats, dict):
+            return stats
+        return self.classify_stats(stats)
+
+    @classmethod
+    def _aggregate(
+        cls,
+        stats: Union[StatsArg, Iterable[Dict[str, Any]]],
+        keep: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, int]:
+        """Sum every summary counter in a single pass over the rows.
+
+        Frontend, backend and server rows each contribute their own set of
+        fields (see _TOTAL_FIELDS), so the result is one flat dict that the
+        summary getters slice up.
+
+        Args:
+            stats: Rows, their classify_stats() grouping, or an iterator
+                such as _iter_stats()
+            keep: If given, each row is also appended here, so a streamed
+                parse yields both the rows and the totals in one pass
+        """
+        if isinstance(stats, dict):
+            rows = [s for group in stats.values() for s in group]
+        else:
+            rows = stats
+
+        totals = dict.fromkeys(cls._ALL_TOTAL_FIELDS, 0)
+        by_svname = cls._TOTAL_FIELDS
+        server_fields = cls._SERVER_TOTAL_FIELDS
+
+        keep_row = keep.append if keep is not None else None
+
+        for s in rows:
+            if keep_row is not None:
+                keep_row(s)
+            for key in by_svname.get(_svname(s), server_fields):
+                totals[key] += s.get(key) or 0
+
+        return totals
+
+    def get_connection_stats(
+        self,
+        stats: Optional[StatsArg] = None,
+        info: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
         """Get connection-related statistics summary.
 
+        Args:
+            stats: Pre-fetched rows, as for get_frontend_stats()
+            info: Pre-fetched show_info() output; queried when omitted
+
         Returns:
             Dictionary with connection metrics
         """
-        info = self.show_info()
-        stats = self.get_frontend_stats()
-
-        total_scur = sum(int(s.get('scur', 0) or 0) for s in stats)
-        total_slim = sum(int(s.get('slim', 0) or 0) for s in stats)
-        total_stot = sum(int(s.get('stot', 0) or 0) for s in stats)
+        if info is None:
+            info = self.show_info()
+        return self._connection_summary(self._frontend_totals(stats), info)
+
+    @staticmethod
+    def _connection_summary(
+        totals: Dict[str, int],
+        info: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """Build the get_connection_stats() dict from totals."""
+        total_scur = totals['scur']
+        total_slim = totals['slim']
 
         return {
             'current_connections': total_scur,
             'max_connections': total_slim,
-            'total_connections': total_stot,
+            'total_connections': totals['stot'],
             'connection_rate': info.get('ConnRate', '0'),
             'max_connection_rate': info.get('MaxConnRate', '0'),
             'utilization_pct': (total_scur / total_slim * 100)
                                if total_slim > 0 else 0
         }
 
-    def get_throughput_stats(self) -> Dict[str, int]:
+    def get_throughput_stats(
+        self,
+        stats: Optional[StatsArg] = None
+    ) -> Dict[str, int]:
         """Get throughput statistics.
 
+        Args:
+            stats: Pre-fetched rows, as for get_frontend_stats()
+
         Returns:
             Dictionary with bytes_in, bytes_out, and requests_total
         """
-        stats = self.get_frontend_stats()
+        return self._throughput_summary(self._frontend_totals(stats))
 
+    @staticmethod
+    def _throughput_summary(totals: Dict[str, int]) -> Dict[str, int]:
+        """Build the get_throughput_stats() dict from totals."""
         return {
-            'bytes_in': sum(int(s.get('bin', 0) or 0) for s in stats),
-            'bytes_out': sum(int(s.get('bout', 0) or 0) for s in stats),
-            'requests_total': sum(int(s.get('req_tot', 0) or 0) for s in stats)
+            'bytes_in': totals['bin'],
+            'bytes_out': totals['bout'],
+            'requests_total': totals['req_tot']
         }
 
-    def get_error_stats(self) -> Dict[str, int]:
+    def get_error_stats(
+        self,
+        stats: Optional[StatsArg] = None
+    ) -> Dict[str, int]:
         """Get error statistics.
 
+        Args:
+            stats: Pre-fetched rows, as for get_frontend_stats(); a single
+                show_stat() query is made when omitted
+
         Returns:
             Dictionary with various error counts
         """
-        frontend_stats = self.get_frontend_stats()
-        backend_stats = self.get_backend_stats()
-        server_stats = self.get_server_stats()
+        if stats is None:
+            stats = self.show_stat()
+        return self._error_summary(self._aggregate(stats))
 
+    @staticmethod
+    def _error_summary(totals: Dict[str, int]) -> Dict[str, int]:
+        """Build the get_error_stats() dict from totals."""
         return {
-            'request_errors': sum(
-                int(s.get('ereq', 0) or 0) for s in frontend_stats
-            ),
-            'denied_requests': sum(
-                int(s.get('dreq', 0) or 0) for s in frontend_stats
-            ),
-            'client_aborts': sum(
-                int(s.get('cli_abrt', 0) or 0) for s in backend_stats
-            ),
-            'server_aborts': sum(
-                int(s.get('srv_abrt', 0) or 0) for s in server_stats
-            ),
-            'connection_errors': sum(
-                int(s.get('econ', 0) or 0) for s in server_stats
-            ),
-            'response_errors': sum(
-                int(s.get('eresp', 0) or 0) for s in server_stats
-            )
+            'request_errors': totals['ereq'],
+            'denied_requests': totals['dreq'],
+            'client_aborts': totals['cli_abrt'],
+            'server_aborts': totals['srv_abrt'],
+            'connection_errors': totals['econ'],
+            'response_errors': totals['eresp']
         }
 
-    def get_http_response_codes(self) -> Dict[str, int]:
+    def get_http_response_codes(
+        self,
+        stats: Optional[StatsArg] = None
+    ) -> Dict[str, int]:
         """Get HTTP response code counts.
 
+        Args:
+            stats: Pre-fetched rows, as for get_frontend_stats()
+
         Returns:
             Dictionary with counts for each HTTP response class
         """
-        stats = self.get_frontend_stats()
+        return self._http_code_summary(self._frontend_totals(stats))
 
+    @staticmethod
+    def _http_code_summary(totals: Dict[str, int]) -> Dict[str, int]:
+        """Build the get_http_response_codes() dict from totals."""
         return {
-            '1xx': sum(int(s.get('hrsp_1xx', 0) or 0) for s in stats),
-            '2xx': sum(int(s.get('hrsp_2xx', 0) or 0) for s in stats),
-            '3xx': sum(int(s.get('hrsp_3xx', 0) or 0) for s in stats),
-            '4xx': sum(int(s.get('hrsp_4xx', 0) or 0) for s in stats),
-            '5xx': sum(int(s.get('hrsp_5xx', 0) or 0) for s in stats)
+            '1xx': totals['hrsp_1xx'],
+            '2xx': totals['hrsp_2xx'],
+            '3xx': totals['hrsp_3xx'],
+            '4xx': totals['hrsp_4xx'],
+            '5xx': totals['hrsp_5xx']
         }
 
+    def _frontend_totals(self, stats: Optional[StatsArg]) -> Dict[str, int]:
+        """Aggregate the given rows, or query frontends when omitted."""
+        if stats is None:
+            stats = self.show_stat(object_type=1)  # 1 = frontends
+        return self._aggregate(stats)
+
     def collect(self) -> Dict[str, Any]:
         """Collect all metrics in one call.
 
@@ -322,13 +671,26 @@ class HAProxyStatsCollector:
             Dictionary with all metrics organized by category
         """
         try:
+            # One show_stat query feeds every summary; it goes to the
+            # socket together with show_info
+            info_output, stats_output = self._query_socket_multi(
+                list(self.COLLECT_QUERIES)
+            )
+            info = self._parse_info(info_output)
+
+            # Parse and aggregate the rows in the same pass
+            raw_stats = []
+            totals = self._aggregate(
+                self._iter_stats(stats_output), keep=raw_stats
+            )
+
             return {
-                'info': self.show_info(),
-                'raw_stats': self.show_stat(),
-                'connections': self.get_connection_stats(),
-                'throughput': self.get_throughput_stats(),
-                'errors': self.get_error_stats(),
-                'http_codes': self.get_http_response_codes()
+                'info': info,
+                'raw_stats': raw_stats,
+                'connections': self._connection_summary(totals, info),
+                'throughput': self._throughput_summary(totals),
+                'errors': self._error_summary(totals),
+                'http_codes': self._http_code_summary(totals)
             }
         except Exception as e:
             logger.error(f"Failed to collect HAProxy stats: {e}")
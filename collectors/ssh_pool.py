@@ -0,0 +1,147 @@
+"""Authenticated SSH connections shared between collectors."""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional
+
+import paramiko
+
+
+class _PoolEntry:
+    """A pooled client and the number of collectors holding it.
+
+    ``lock`` serializes connecting for this key only; ``refs`` is guarded
+    by the pool lock.
+    """
+
+    __slots__ = ('client', 'refs', 'lock')
+
+    def __init__(self):
+        self.client: Optional[paramiko.SSHClient] = None
+        self.refs = 0
+        self.lock = threading.Lock()
+
+
+class SSHConnectionPool:
+    """Thread-safe pool of authenticated SSH clients.
+
+    Collectors that talk to the same host as the same user share one
+    client, and a collector that disconnects and reconnects gets the
+    existing session back instead of authenticating again. Keys are
+    tuples such as (username, host, port) built by the collectors.
+
+    Clients nobody holds are kept open for reuse; once more than max_size
+    keys are pooled, the least recently used idle ones are closed.
+    """
+
+    def __init__(self, max_size: int = 32):
+        """Initialize the pool.
+
+        Args:
+            max_size: Number of keys kept before idle clients are closed
+        """
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, _PoolEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        key: Hashable,
+        factory: Callable[[], paramiko.SSHClient]
+    ) -> paramiko.SSHClient:
+        """Get a connected client for key, creating one if needed.
+
+        Args:
+            key: Pool key
+            factory: Called to connect a new client when none is usable
+
+        Returns:
+            Connected SSH client; pair with release(key)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _PoolEntry()
+            self._entries.move_to_end(key)
+            # Held from here so the entry is not evicted while connecting
+            entry.refs += 1
+
+        # Connecting under the key's lock keeps two collectors from
+        # opening duplicate sessions to the same host, without stalling
+        # callers for other hosts behind a slow SSH handshake
+        try:
+            with entry.lock:
+                if not _is_active(entry.client):
+                    stale, entry.client = entry.client, None
+                    if stale is not None:
+                        stale.close()
+                    entry.client = factory()
+                return entry.client
+        except BaseException:
+            with self._lock:
+                entry.refs -= 1
+            raise
+
+    def release(self, key: Hashable):
+        """Give back a client obtained from acquire(key)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.refs > 0:
+                entry.refs -= 1
+            closing = self._evict()
+        for client in closing:
+            client.close()
+
+    def invalidate(self, key: Hashable, client: paramiko.SSHClient):
+        """Close a broken client so the next acquire(key) reconnects.
+
+        Args:
+            key: Pool key
+            client: The client that failed; ignored if already replaced
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return
+        with entry.lock:
+            if entry.client is not client:
+                return
+            entry.client = None
+        client.close()
+
+    def close_all(self):
+        """Close every pooled client."""
+        with self._lock:
+            entries, self._entries = self._entries, OrderedDict()
+        for entry in entries.values():
+            with entry.lock:
+                client, entry.client = entry.client, None
+            if client is not None:
+                client.close()
+
+    def _evict(self) -> List[paramiko.SSHClient]:
+        """Drop idle least-recently-used keys beyond max_size.
+
+        Must be called with the lock held; returns the clients to close.
+        """
+        closing = []
+        excess = len(self._entries) - self.max_size
+        for key in list(self._entries):
+            if excess <= 0:
+                break
+            entry = self._entries[key]
+            if entry.refs:
+                continue
+            del self._entries[key]
+            excess -= 1
+            if entry.client is not None:
+                closing.append(entry.client)
+        return closing
+
+
+def _is_active(client: Optional[paramiko.SSHClient]) -> bool:
+    """Whether client still has a live transport."""
+    if client is None:
+        return False
+    transport = client.get_transport()
+    return transport is not None and transport.is_active()
@@ -1,11 +1,172 @@
 """Metrics storage using SQLite."""
 
 import json
+import queue
 import sqlite3
+import sys
+import threading
+import time
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Integer haproxy_stats columns, in INSERT order; each is read from the
+# 'show stat' field of the same name
+_HAPROXY_INT_FIELDS = (
+    'scur', 'smax', 'slim', 'stot', 'bin', 'bout', 'dreq', 'ereq', 'weight',
+    'rate', 'rate_max', 'req_rate', 'req_tot',
+    'hrsp_1xx', 'hrsp_2xx', 'hrsp_3xx', 'hrsp_4xx', 'hrsp_5xx',
+    'qcur', 'qmax', 'cli_abrt', 'srv_abrt',
+)
+
+
+def _haproxy_row(
+    stat: Dict[str, Any],
+    run_id: int,
+    timestamp: int,
+    amphora_id: str,
+    lb_id: str,
+    to_int: Callable[[Any], Optional[int]],
+    dumps: Callable[[Any], bytes]
+) -> tuple:
+    """Build one haproxy_stats INSERT tuple, in _SQL_INS_HAPROXY order.
+
+    Values that are already ints are used as-is; anything else goes
+    through to_int.
+    """
+    get = stat.get
+    return (
+        run_id, timestamp, amphora_id, lb_id,
+        get('pxname'), get('svname'), get('status'),
+        *[v if v.__class__ is int else to_int(v)
+          for v in map(get, _HAPROXY_INT_FIELDS)],
+        dumps(stat)
+    )
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a raw_data column value as compact UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _now_us() -> int:
+    """Current time as integer microseconds since the Unix epoch."""
+    return time.time_ns() // 1000
+
+
+def _us_to_iso(value: int) -> str:
+    """Format epoch microseconds as a naive UTC ISO 8601 string."""
+    return (_EPOCH + value * _MICROSECOND).isoformat()
+
+
+def _to_us(value: Union[int, str]) -> int:
+    """Convert a time filter to epoch microseconds.
+
+    Args:
+        value: Epoch microseconds, or an ISO 8601 string (naive values
+            are taken as UTC, as returned by the get_* methods)
+
+    Returns:
+        Epoch microseconds
+    """
+    if isinstance(value, int):
+        return value
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def _raw_row(row: Dict) -> Dict:
+    """Convert a row dict in place to the form returned by get_* methods.
+
+    Integer timestamps become ISO strings and raw_data is decoded back
+    to JSON text. Databases written before those columns changed hold
+    TEXT, which passes through unchanged.
+    """
+    ts = row.get('timestamp')
+    if ts.__class__ is int:
+        row['timestamp'] = _us_to_iso(ts)
+    raw = row.get('raw_data')
+    if raw.__class__ is bytes:
+        row['raw_data'] = raw.decode('utf-8')
+    return row
+
+
+def _pretty_json(value: Any, indent: int) -> str:
+    """Serialize value with 2-space indentation, nested `indent` deep."""
+    if ORJSON_AVAILABLE:
+        text = orjson.dumps(
+            value, option=orjson.OPT_INDENT_2, default=str
+        ).decode('utf-8')
+    else:
+        text = json.dumps(value, indent=2, default=str)
+    return text.replace('\n', '\n' + ' ' * indent)
+
+
+# INSERT statements, shared by every call so the connections' statement
+# caches always hit
+_SQL_INS_HAPROXY = """
+    INSERT INTO haproxy_stats (
+        run_id, timestamp, amphora_id, lb_id,
+        proxy_name, server_name, status,
+        scur, smax, slim, stot, bin, bout, dreq, ereq, weight,
+        rate, rate_max, req_rate, req_tot,
+        hrsp_1xx, hrsp_2xx, hrsp_3xx, hrsp_4xx, hrsp_5xx,
+        qcur, qmax, cli_abrt, srv_abrt, raw_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+              ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INS_SYS = """
+    INSERT INTO system_metrics (
+        run_id, timestamp, host_id, host_type,
+        cpu_user, cpu_system, cpu_softirq, cpu_total, cpu_count,
+        mem_total, mem_free, mem_buffers, mem_cached, mem_swap_used,
+        disk_used, disk_available,
+        load_1, load_5, load_15,
+        network_tx, network_rx, raw_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INS_LOCUST = """
+    INSERT INTO locust_stats (
+        run_id, timestamp, name, method,
+        num_requests, num_failures,
+        median_response_time, average_response_time,
+        min_response_time, max_response_time,
+        avg_content_length, requests_per_sec, failures_per_sec,
+        p50, p90, p95, p99,
+        current_rps, current_fail_per_sec, raw_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+# Memory-mapped I/O window for reads: 1 GiB, or 256 MiB on 32-bit builds
+# where address space is scarce. Pages beyond it fall back to read().
+_MMAP_SIZE = (1 << 30) if sys.maxsize > 2**32 else (256 << 20)
+
+# Per-connection settings. synchronous=NORMAL is durable across
+# application crashes in WAL mode and skips the fsync on every commit.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    f"PRAGMA mmap_size={_MMAP_SIZE}",
+    "PRAGMA cache_size=-20000",
+)
 
 
 class MetricsStorage:
@@ -18,21 +179,115 @@ class MetricsStorage:
     - locust_stats: Locust aggregated statistics
     """
 
+    # Long-lived connections shared by the collector threads
+    POOL_SIZE = 4
+
+    # Rows read per fetch by the streaming iter_* methods
+    ITER_FETCH_ROWS = 512
+
     def __init__(self, db_path: str = "metrics.db"):
         self.db_path = Path(db_path)
+        self._batch = threading.local()
+        self._pool: queue.Queue = queue.Queue()
+        self._pool_lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
         self._init_schema()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a pooled connection."""
+        # Autocommit mode: _get_connection() issues BEGIN/COMMIT itself
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        # WAL is persistent in the database file; readers no longer block
+        # on the collectors' writes
+        if str(self.db_path) != ':memory:':
+            conn.execute("PRAGMA journal_mode=WAL")
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, opening one if the pool isn't full."""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._pool_lock:
+            if len(self._connections) < self.POOL_SIZE:
+                conn = self._connect()
+                self._connections.append(conn)
+                return conn
+        return self._pool.get()
+
     @contextmanager
     def _get_connection(self):
-        """Get a database connection with context management."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Get a database connection with context management.
+
+        Connections come from a small pool and stay open, so SQLite's page
+        cache and compiled statements survive between calls. Each block
+        runs in its own transaction. Inside batch() the calling thread's
+        connection is reused and committed when the batch ends.
+        """
+        batch_conn = getattr(self._batch, 'conn', None)
+        if batch_conn is not None:
+            yield batch_conn
+            return
+
+        conn = self._acquire()
         try:
+            conn.execute("BEGIN")
             yield conn
-            conn.commit()
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
         finally:
+            self._pool.put(conn)
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._pool_lock:
+            connections, self._connections = self._connections, []
+        while True:
+            try:
+                self._pool.get_nowait()
+            except queue.Empty:
+                break
+        for conn in connections:
             conn.close()
 
+    @contextmanager
+    def batch(self):
+        """Group all writes made by this thread into one transaction.
+
+        Wrap a whole sampling tick so the haproxy, system and locust rows
+        share a single commit::
+
+            with storage.batch():
+                storage.store_haproxy_stats(...)
+                storage.store_system_metrics(...)
+                storage.store_locust_stats(...)
+
+        Nested batch() blocks join the outermost transaction.
+        """
+        if getattr(self._batch, 'conn', None) is not None:
+            yield
+            return
+
+        with self._get_connection() as conn:
+            self._batch.conn = conn
+            try:
+                yield
+            finally:
+                self._batch.conn = None
+
     def _init_schema(self):
         """Initialize database schema."""
         with self._get_connection() as conn:
@@ -51,12 +306,17 @@ class MetricsStorage:
                 )
             """)
 
+            # The time-series tables are append-only: ids are plain rowid
+            # aliases (no AUTOINCREMENT, so no sqlite_sequence update per
+            # row), and the run_id foreign keys only document the relation
+            # since foreign_keys enforcement is left off.
+
             # HAProxy statistics table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS haproxy_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id INTEGER PRIMARY KEY,
                     run_id INTEGER NOT NULL,
-                    timestamp TIMESTAMP NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     amphora_id TEXT,
                     lb_id TEXT,
                     proxy_name TEXT,
@@ -84,7 +344,7 @@ class MetricsStorage:
                     qmax INTEGER,
                     cli_abrt INTEGER,
                     srv_abrt INTEGER,
-                    raw_data TEXT,
+                    raw_data BLOB,
                     FOREIGN KEY (run_id) REFERENCES test_runs(id)
                 )
             """)
@@ -92,9 +352,9 @@ class MetricsStorage:
             # System metrics table (for amphora and backend servers)
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS system_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id INTEGER PRIMARY KEY,
                     run_id INTEGER NOT NULL,
-                    timestamp TIMESTAMP NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     host_id TEXT NOT NULL,
                     host_type TEXT NOT NULL,
                     cpu_user INTEGER,
@@ -114,7 +374,7 @@ class MetricsStorage:
                     load_15 REAL,
                     network_tx INTEGER,
                     network_rx INTEGER,
-                    raw_data TEXT,
+                    raw_data BLOB,
                     FOREIGN KEY (run_id) REFERENCES test_runs(id)
                 )
             """)
@@ -122,9 +382,9 @@ class MetricsStorage:
             # Locust statistics table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS locust_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id INTEGER PRIMARY KEY,
                     run_id INTEGER NOT NULL,
-                    timestamp TIMESTAMP NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     name TEXT,
                     method TEXT,
                     num_requests INTEGER,
@@ -142,7 +402,7 @@ class MetricsStorage:
                     p99 REAL,
                     current_rps REAL,
                     current_fail_per_sec REAL,
-                    raw_data TEXT,
+                    raw_data BLOB,
                     FOREIGN KEY (run_id) REFERENCES test_runs(id)
                 )
             """)
@@ -156,6 +416,12 @@ class MetricsStorage:
                 CREATE INDEX IF NOT EXISTS idx_system_run_time
                 ON system_metrics(run_id, timestamp)
             """)
+            # Serves get_system_metrics(run_id, host_type=...) as a seek
+            # returning rows already in timestamp order
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_system_run_type_time
+                ON system_metrics(run_id, host_type, timestamp)
+            """)
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_locust_run_time
                 ON locust_stats(run_id, timestamp)
@@ -185,7 +451,7 @@ class MetricsStorage:
             return cursor.lastrowid
 
     def complete_test_run(self, run_id: int, status: str = "completed"):
-        """Mark a test run as completed."""
+        """Mark a test run as completed and optimize the database."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -196,6 +462,24 @@ class MetricsStorage:
                 """,
                 (datetime.utcnow().isoformat(), status, run_id)
             )
+        self.optimize()
+
+    def optimize(self):
+        """Refresh planner statistics and truncate the WAL.
+
+        PRAGMA optimize re-analyzes tables whose statistics have drifted
+        over the run, so report queries keep using the composite indexes.
+        The checkpoint copies the WAL into the database and resets it.
+        Both must run outside a transaction, so a pooled connection is
+        used directly rather than through _get_connection().
+        """
+        conn = self._acquire()
+        try:
+            conn.execute("PRAGMA optimize")
+            if str(self.db_path) != ':memory:':
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            self._pool.put(conn)
 
     def store_haproxy_stats(
         self,
@@ -205,51 +489,19 @@ class MetricsStorage:
         stats: List[Dict[str, Any]]
     ):
         """Store HAProxy statistics."""
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = _now_us()
+        to_int = self._int_or_none
+        dumps = _dumps
+        build = _haproxy_row
+        # show_stat() already converted the counters, so most values
+        # take the int fast path
+        rows = [
+            build(stat, run_id, timestamp, amphora_id, lb_id, to_int, dumps)
+            for stat in stats
+        ]
+
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            for stat in stats:
-                cursor.execute(
-                    """
-                    INSERT INTO haproxy_stats (
-                        run_id, timestamp, amphora_id, lb_id,
-                        proxy_name, server_name, scur, smax, slim, stot,
-                        bin, bout, dreq, ereq, status, weight,
-                        rate, rate_max, req_rate, req_tot,
-                        hrsp_1xx, hrsp_2xx, hrsp_3xx, hrsp_4xx, hrsp_5xx,
-                        qcur, qmax, cli_abrt, srv_abrt, raw_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                              ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        run_id, timestamp, amphora_id, lb_id,
-                        stat.get('pxname'), stat.get('svname'),
-                        self._int_or_none(stat.get('scur')),
-                        self._int_or_none(stat.get('smax')),
-                        self._int_or_none(stat.get('slim')),
-                        self._int_or_none(stat.get('stot')),
-                        self._int_or_none(stat.get('bin')),
-                        self._int_or_none(stat.get('bout')),
-                        self._int_or_none(stat.get('dreq')),
-                        self._int_or_none(stat.get('ereq')),
-                        stat.get('status'),
-                        self._int_or_none(stat.get('weight')),
-                        self._int_or_none(stat.get('rate')),
-                        self._int_or_none(stat.get('rate_max')),
-                        self._int_or_none(stat.get('req_rate')),
-                        self._int_or_none(stat.get('req_tot')),
-                        self._int_or_none(stat.get('hrsp_1xx')),
-                        self._int_or_none(stat.get('hrsp_2xx')),
-                        self._int_or_none(stat.get('hrsp_3xx')),
-                        self._int_or_none(stat.get('hrsp_4xx')),
-                        self._int_or_none(stat.get('hrsp_5xx')),
-                        self._int_or_none(stat.get('qcur')),
-                        self._int_or_none(stat.get('qmax')),
-                        self._int_or_none(stat.get('cli_abrt')),
-                        self._int_or_none(stat.get('srv_abrt')),
-                        json.dumps(stat)
-                    )
-                )
+            conn.executemany(_SQL_INS_HAPROXY, rows)
 
     def store_system_metrics(
         self,
@@ -259,7 +511,7 @@ class MetricsStorage:
         metrics: Dict[str, Any]
     ):
         """Store system metrics (CPU, memory, network, etc.)."""
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = _now_us()
 
         # Extract CPU metrics
         cpu = metrics.get('cpu', {})
@@ -267,24 +519,16 @@ class MetricsStorage:
         disk = metrics.get('disk', {})
         load = metrics.get('load', [0, 0, 0])
 
-        # Sum network tx/rx across all interfaces
-        networks = metrics.get('networks', {})
-        total_tx = sum(n.get('network_tx', 0) for n in networks.values())
-        total_rx = sum(n.get('network_rx', 0) for n in networks.values())
+        # Sum network tx/rx across all interfaces in one pass
+        total_tx = total_rx = 0
+        for n in metrics.get('networks', {}).values():
+            total_tx += n.get('network_tx', 0)
+            total_rx += n.get('network_rx', 0)
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                INSERT INTO system_metrics (
-                    run_id, timestamp, host_id, host_type,
-                    cpu_user, cpu_system, cpu_softirq, cpu_total, cpu_count,
-                    mem_total, mem_free, mem_buffers, mem_cached, mem_swap_used,
-                    disk_used, disk_available,
-                    load_1, load_5, load_15,
-                    network_tx, network_rx, raw_data
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _SQL_INS_SYS,
                 (
                     run_id, timestamp, host_id, host_type,
                     self._int_or_none(cpu.get('user')),
@@ -304,27 +548,17 @@ class MetricsStorage:
                     float(load[2]) if len(load) > 2 else None,
                     total_tx,
                     total_rx,
-                    json.dumps(metrics)
+                    _dumps(metrics)
                 )
             )
 
     def store_locust_stats(self, run_id: int, stats: Dict[str, Any]):
         """Store Locust statistics."""
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = _now_us()
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                INSERT INTO locust_stats (
-                    run_id, timestamp, name, method,
-                    num_requests, num_failures,
-                    median_response_time, average_response_time,
-                    min_response_time, max_response_time,
-                    avg_content_length, requests_per_sec, failures_per_sec,
-                    p50, p90, p95, p99,
-                    current_rps, current_fail_per_sec, raw_data
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _SQL_INS_LOCUST,
                 (
                     run_id, timestamp,
                     stats.get('name'), stats.get('method'),
@@ -342,33 +576,47 @@ class MetricsStorage:
                     stats.get('response_times', {}).get('99'),
                     stats.get('current_rps'),
                     stats.get('current_fail_per_sec'),
-                    json.dumps(stats)
+                    _dumps(stats)
                 )
             )
 
     def get_haproxy_stats(
         self,
         run_id: int,
-        start_time: Optional[str] = None,
-        end_time: Optional[str] = None
+        start_time: Optional[Union[int, str]] = None,
+        end_time: Optional[Union[int, str]] = None
     ) -> List[Dict]:
-        """Get HAProxy stats for a test run."""
+        """Get HAProxy stats for a test run.
+
+        Args:
+            run_id: Test run ID
+            start_time: Earliest sample, as epoch microseconds or ISO 8601
+            end_time: Latest sample, as epoch microseconds or ISO 8601
+
+        Returns:
+            Rows ordered by timestamp, with ISO 8601 timestamps
+        """
+        return list(self.iter_haproxy_stats(run_id, start_time, end_time))
+
+    def iter_haproxy_stats(
+        self,
+        run_id: int,
+        start_time: Optional[Union[int, str]] = None,
+        end_time: Optional[Union[int, str]] = None
+    ) -> Iterator[Dict]:
+        """Yield HAProxy stats for a test run one row at a time."""
         query = "SELECT * FROM haproxy_stats WHERE run_id = ?"
         params = [run_id]
 
         if start_time:
             query += " AND timestamp >= ?"
-            params.append(start_time)
+            params.append(_to_us(start_time))
         if end_time:
             query += " AND timestamp <= ?"
-            params.append(end_time)
+            params.append(_to_us(end_time))
 
         query += " ORDER BY timestamp"
-
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        return self._iter_rows(query, params)
 
     def get_system_metrics(
         self,
@@ -376,6 +624,14 @@ class MetricsStorage:
         host_type: Optional[str] = None
     ) -> List[Dict]:
         """Get system metrics for a test run."""
+        return list(self.iter_system_metrics(run_id, host_type))
+
+    def iter_system_metrics(
+        self,
+        run_id: int,
+        host_type: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """Yield system metrics for a test run one row at a time."""
         query = "SELECT * FROM system_metrics WHERE run_id = ?"
         params = [run_id]
 
@@ -384,21 +640,44 @@ class MetricsStorage:
             params.append(host_type)
 
         query += " ORDER BY timestamp"
-
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        return self._iter_rows(query, params)
 
     def get_locust_stats(self, run_id: int) -> List[Dict]:
         """Get Locust stats for a test run."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM locust_stats WHERE run_id = ? ORDER BY timestamp",
-                (run_id,)
-            )
-            return [dict(row) for row in cursor.fetchall()]
+        return list(self.iter_locust_stats(run_id))
+
+    def iter_locust_stats(self, run_id: int) -> Iterator[Dict]:
+        """Yield Locust stats for a test run one row at a time."""
+        return self._iter_rows(
+            "SELECT * FROM locust_stats WHERE run_id = ? ORDER BY timestamp",
+            (run_id,)
+        )
+
+    def _iter_rows(self, query: str, params) -> Iterator[Dict]:
+        """Run a time-series query and yield rows as they are read.
+
+        Rows come back as plain tuples and are zipped with the column
+        names read once from the cursor, which is cheaper than building
+        each dict from a sqlite3.Row.
+
+        Each iterator reads on its own connection instead of a pooled
+        one, so an iterator abandoned part-way never leaves writers
+        blocked in _acquire(). The connection is closed when the iterator
+        is exhausted, closed or garbage collected.
+        """
+        conn = self._connect()
+        try:
+            conn.row_factory = None
+            cursor = conn.execute(query, params)
+            columns = tuple(d[0] for d in cursor.description)
+            while True:
+                rows = cursor.fetchmany(self.ITER_FETCH_ROWS)
+                if not rows:
+                    break
+                for values in rows:
+                    yield _raw_row(dict(zip(columns, values)))
+        finally:
+            conn.close()
 
     def get_test_run(self, run_id: int) -> Optional[Dict]:
         """Get test run metadata."""
@@ -419,15 +698,30 @@ class MetricsStorage:
             return [dict(row) for row in cursor.fetchall()]
 
     def export_to_json(self, run_id: int, output_path: str):
-        """Export all data for a test run to JSON."""
-        data = {
-            'test_run': self.get_test_run(run_id),
-            'haproxy_stats': self.get_haproxy_stats(run_id),
-            'system_metrics': self.get_system_metrics(run_id),
-            'locust_stats': self.get_locust_stats(run_id)
-        }
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        """Export all data for a test run to JSON.
+
+        Rows are streamed from the database straight into the file, so
+        memory use stays flat however long the run was.
+        """
+        sections = (
+            ('haproxy_stats', self.iter_haproxy_stats(run_id)),
+            ('system_metrics', self.iter_system_metrics(run_id)),
+            ('locust_stats', self.iter_locust_stats(run_id)),
+        )
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write('{\n  "test_run": ')
+            f.write(_pretty_json(self.get_test_run(run_id), 2))
+            for name, rows in sections:
+                f.write(f',\n  "{name}": [')
+                separator = '\n    '
+                for row in rows:
+                    f.write(separator)
+                    f.write(_pretty_json(row, 4))
+                    separator = ',\n    '
+                # An empty list stays on one line, like json.dump's '[]'
+                f.write(']' if separator == '\n    ' else '\n  ]')
+            f.write('\n}')
 
     @staticmethod
     def _int_or_none(value) -> Optional[int]:
@@ -1,13 +1,107 @@
 """System metrics collector for backend servers via SSH."""
 
+import http.client
 import logging
 import re
-from typing import Any, Dict, List, Optional
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import paramiko
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .cache import MetricsCache
+from .ssh_pool import SSHConnectionPool
+
 logger = logging.getLogger(__name__)
 
+# Section header lines echoed between the outputs of a batched command
+_SECTION_RE = re.compile(r'^---(\w+)---$', re.MULTILINE)
+
+# Only the /proc/meminfo lines get_memory_stats() reports are sent back
+_MEMINFO_COMMAND = (
+    "grep -E '^(MemTotal|MemFree|MemAvailable|Buffers|Cached"
+    "|SwapTotal|SwapFree):' /proc/meminfo"
+)
+
+# First /proc/stat line, read with shell builtins so nothing is spawned
+_CPU_LINE_COMMAND = 'read -r line < /proc/stat && echo "$line"'
+
+# nginx stub_status lines
+_NGINX_ACTIVE_RE = re.compile(r'Active connections:\s*(\d+)')
+_NGINX_RWW_RE = re.compile(
+    r'Reading:\s*(\d+)\s*Writing:\s*(\d+)\s*Waiting:\s*(\d+)'
+)
+
+# /proc/net/dev counters kept per interface, by column after the colon
+_NET_DEV_KEYS = (
+    'rx_bytes', 'rx_packets', 'rx_errors', 'rx_dropped',
+    'tx_bytes', 'tx_packets', 'tx_errors', 'tx_dropped'
+)
+_NET_DEV_COLUMNS = (0, 1, 2, 3, 8, 9, 10, 11)
+_NET_DEV_FIELDS = 16
+
+# Below this many interfaces the per-line loop beats numpy's setup cost
+_NUMPY_NET_DEV_MIN = 32
+
+
+def _parse_net_dev_bulk(
+    interfaces: List[str],
+    counters: List[str]
+) -> Optional[Dict[str, Dict[str, int]]]:
+    """Convert /proc/net/dev counter columns in one numpy call.
+
+    Args:
+        interfaces: Interface names
+        counters: Text after each interface's colon
+
+    Returns:
+        Per-interface counters as Python ints, or None if any line does not
+        have the usual column count
+    """
+    try:
+        table = np.fromstring(' '.join(counters), dtype=np.uint64, sep=' ')
+    except ValueError:
+        return None
+    if table.size != len(interfaces) * _NET_DEV_FIELDS:
+        return None
+
+    rows = table.reshape(len(interfaces), _NET_DEV_FIELDS)
+    rows = rows[:, _NET_DEV_COLUMNS].tolist()
+    return {
+        interface: dict(zip(_NET_DEV_KEYS, row))
+        for interface, row in zip(interfaces, rows)
+    }
+
+
+class _ChannelHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection carried over an SSH direct-tcpip channel.
+
+    Requests reach a port on the remote host's loopback without a local
+    listener; the channel stays open between requests while the server
+    keeps the connection alive.
+    """
+
+    def __init__(self, transport: paramiko.Transport, port: int,
+                 timeout: float):
+        super().__init__('localhost', port, timeout=timeout)
+        self._transport = transport
+
+    def connect(self):
+        """Open a forwarded channel to the remote port."""
+        self.sock = self._transport.open_channel(
+            'direct-tcpip', ('127.0.0.1', self.port), ('127.0.0.1', 0),
+            timeout=self.timeout
+        )
+        self.sock.settimeout(self.timeout)
+
 
 class SystemMetricsCollector:
     """Collects system metrics from Linux servers via SSH.
@@ -22,6 +116,34 @@ class SystemMetricsCollector:
     Designed for collecting metrics from backend servers during load tests.
     """
 
+    # Commands behind collect(), run as a single SSH exec per cycle
+    COLLECT_COMMANDS: Tuple[Tuple[str, str], ...] = (
+        ('cpu', _CPU_LINE_COMMAND),
+        ('memory', _MEMINFO_COMMAND),
+        ('load', 'cat /proc/loadavg'),
+        ('network', 'cat /proc/net/dev'),
+        ('disk', 'df -B1 /'),
+        ('cpu_count', 'nproc'),
+    )
+
+    # nginx stub_status endpoint on the monitored host
+    NGINX_STATUS_PORT = 80
+    NGINX_STATUS_PATH = '/nginx_status'
+
+    # Default seconds collect() reuses disk usage before re-reading it
+    DEFAULT_CACHE_TTL = 60.0
+
+    # Seconds between SSH keepalives on an otherwise idle connection
+    KEEPALIVE_INTERVAL = 30
+
+    # Timeout for reads on the persistent shell channel
+    CHANNEL_TIMEOUT = 30
+
+    # Sent after each command on the persistent shell; its output marks
+    # where the command's output ends
+    _END_COMMAND = "\nprintf '\\n__octavia_perf_end__\\n'\n"
+    _END_MARK = b'\n__octavia_perf_end__\n'
+
     def __init__(
         self,
         host_ip: str,
@@ -29,7 +151,11 @@ class SystemMetricsCollector:
         ssh_username: str = "vagrant",
         ssh_key_path: Optional[str] = None,
         ssh_password: Optional[str] = None,
-        ssh_port: int = 22
+        ssh_port: int = 22,
+        ssh_pool: Optional[SSHConnectionPool] = None,
+        cache_ttl_s: float = DEFAULT_CACHE_TTL,
+        interfaces: Optional[List[str]] = None,
+        nginx_reprobe_s: Optional[float] = None
     ):
         """Initialize the system metrics collector.
 
@@ -40,6 +166,14 @@ class SystemMetricsCollector:
             ssh_key_path: Path to SSH private key
             ssh_password: SSH password (alternative to key)
             ssh_port: SSH port
+            ssh_pool: Pool to share authenticated SSH sessions through
+                (optional; by default the collector owns its connection)
+            cache_ttl_s: Seconds collect() reuses disk usage; the CPU
+                count is read once. 0 re-reads both every cycle.
+            interfaces: Network interfaces to report, as names or grep -E
+                patterns such as 'ens[0-9]+' (default: all)
+            nginx_reprobe_s: Seconds after finding no nginx status page
+                before get_nginx_stats() looks again (default: never)
         """
         self.host_ip = host_ip
         self.host_id = host_id
@@ -47,16 +181,61 @@ class SystemMetricsCollector:
         self.ssh_key_path = ssh_key_path
         self.ssh_password = ssh_password
         self.ssh_port = ssh_port
+        self.ssh_pool = ssh_pool
+        self.interfaces = interfaces
+        self.nginx_reprobe_s = nginx_reprobe_s
+        self._pool_key = (ssh_username, host_ip, ssh_port)
         self._ssh_client: Optional[paramiko.SSHClient] = None
         self._prev_cpu: Optional[Dict[str, int]] = None
+        self._channels: List[paramiko.Channel] = []
+        self._channels_lock = threading.Lock()
+
+        # Keep-alive HTTP connection to nginx over the SSH transport;
+        # cleared to False if the server refuses port forwarding
+        self._nginx_conn: Optional[_ChannelHTTPConnection] = None
+        self._nginx_forward = True
+
+        # Whether the host served a stub_status page when last asked
+        # (None until probed), and when a missing page was last seen
+        self._nginx_present: Optional[bool] = None
+        self._nginx_checked = 0.0
+
+        # collect() sections that rarely change, with how long their
+        # output is reused
+        self._section_ttls = {
+            'cpu_count': float('inf') if cache_ttl_s else 0,
+            'disk': cache_ttl_s,
+        }
+        self._section_cache = MetricsCache(ttl=cache_ttl_s)
+
+        # /proc/net/dev, filtered on the remote side to the interfaces
+        # of interest
+        self._network_command = 'cat /proc/net/dev'
+        if interfaces:
+            self._network_command = (
+                f"grep -E '^ *({'|'.join(interfaces)}):' /proc/net/dev"
+            )
+        self._collect_commands = tuple(
+            (name, self._network_command if name == 'network' else command)
+            for name, command in self.COLLECT_COMMANDS
+        )
 
     def connect(self):
-        """Establish SSH connection."""
+        """Establish SSH connection, or take one from ssh_pool."""
         if self._ssh_client is not None:
             return
 
-        self._ssh_client = paramiko.SSHClient()
-        self._ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        if self.ssh_pool is not None:
+            self._ssh_client = self.ssh_pool.acquire(
+                self._pool_key, self._open_client
+            )
+        else:
+            self._ssh_client = self._open_client()
+
+    def _open_client(self) -> paramiko.SSHClient:
+        """Open and authenticate a new SSH connection."""
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
         connect_kwargs = {
             'hostname': self.host_ip,
@@ -70,42 +249,150 @@ class SystemMetricsCollector:
             connect_kwargs['password'] = self.ssh_password
 
         try:
-            self._ssh_client.connect(**connect_kwargs)
+            client.connect(**connect_kwargs)
+            transport = client.get_transport()
+            transport.set_keepalive(self.KEEPALIVE_INTERVAL)
+            # Commands are small request/response exchanges; don't let
+            # Nagle hold them back. Every channel shares this socket.
+            if isinstance(transport.sock, socket.socket):
+                transport.sock.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+                )
             logger.info(f"Connected to {self.host_id} ({self.host_ip})")
         except Exception as e:
-            self._ssh_client = None
             logger.error(f"Failed to connect to {self.host_id}: {e}")
             raise
+        return client
 
     def disconnect(self):
-        """Close SSH connection."""
+        """Close SSH connection, or return it to ssh_pool."""
+        with self._channels_lock:
+            channels, self._channels = self._channels, []
+        for channel in channels:
+            channel.close()
+        if self._nginx_conn is not None:
+            self._nginx_conn.close()
+            self._nginx_conn = None
         if self._ssh_client:
-            self._ssh_client.close()
+            if self.ssh_pool is not None:
+                self.ssh_pool.release(self._pool_key)
+            else:
+                self._ssh_client.close()
             self._ssh_client = None
             logger.info(f"Disconnected from {self.host_id}")
 
+    def _reconnect(self):
+        """Drop a broken SSH connection and open a new one."""
+        if self.ssh_pool is not None:
+            self.ssh_pool.invalidate(self._pool_key, self._ssh_client)
+        self.disconnect()
+        self.connect()
+
     def _execute_command(self, command: str) -> str:
-        """Execute a command via SSH and return output."""
+        """Execute a command via SSH and return output.
+
+        Commands go to a persistent shell channel, so each one costs a
+        single round-trip instead of a new SSH channel and login shell.
+        If the channel fails, the command falls back to a one-shot exec,
+        and if the connection itself has dropped, it reconnects and
+        retries once.
+        """
         if self._ssh_client is None:
             self.connect()
 
+        with self._channels_lock:
+            channel = self._channels.pop() if self._channels else None
+
         try:
-            stdin, stdout, stderr = self._ssh_client.exec_command(command)
+            if channel is None:
+                channel = self._open_channel()
+            channel.sendall((command + self._END_COMMAND).encode('utf-8'))
+            output = self._read_response(channel)
+        except (OSError, EOFError, paramiko.SSHException) as e:
+            logger.debug(f"Shell channel failed on {self.host_id}, "
+                         f"using one-shot exec: {e}")
+            if channel is not None:
+                channel.close()
+        else:
+            with self._channels_lock:
+                self._channels.append(channel)
+            return output
+
+        try:
+            try:
+                stdin, stdout, stderr = self._ssh_client.exec_command(command)
+            except (EOFError, paramiko.SSHException) as e:
+                logger.warning(f"SSH connection to {self.host_id} lost, "
+                               f"reconnecting: {e}")
+                self._reconnect()
+                stdin, stdout, stderr = self._ssh_client.exec_command(command)
             return stdout.read().decode('utf-8').strip()
         except Exception as e:
             logger.error(f"Command execution failed on {self.host_id}: {e}")
             raise
 
+    def _open_channel(self) -> paramiko.Channel:
+        """Open a persistent shell session for running commands."""
+        channel = self._ssh_client.get_transport().open_session()
+        channel.settimeout(self.CHANNEL_TIMEOUT)
+        try:
+            # No pty, so nothing is echoed; stderr is discarded so it
+            # can't fill the channel window unread
+            channel.exec_command('exec sh 2>/dev/null')
+        except Exception:
+            channel.close()
+            raise
+        return channel
+
+    def _read_response(self, channel: paramiko.Channel) -> str:
+        """Read one command's output, up to the end mark."""
+        buf = bytearray()
+        while not buf.endswith(self._END_MARK):
+            data = channel.recv(65536)
+            if not data:
+                raise EOFError("Shell channel closed")
+            buf += data
+        return buf[:-len(self._END_MARK)].decode('utf-8').strip()
+
+    def _execute_batch(
+        self,
+        commands: Iterable[Tuple[str, str]]
+    ) -> Dict[str, str]:
+        """Run several commands in one SSH exec and split their output.
+
+        Each command's output is preceded by a ``---name---`` line so the
+        combined output can be split back up locally.
+
+        Args:
+            commands: (name, command) pairs
+
+        Returns:
+            Dictionary of name -> stripped command output
+        """
+        script = '; '.join(
+            f"echo '---{name}---'; {command}" for name, command in commands
+        )
+        parts = _SECTION_RE.split(self._execute_command(script))
+        # parts is ['', name1, output1, name2, output2, ...]
+        return {
+            name: output.strip()
+            for name, output in zip(parts[1::2], parts[2::2])
+        }
+
     def get_cpu_stats(self) -> Dict[str, Any]:
         """Get CPU statistics from /proc/stat.
 
         Returns:
             Dictionary with CPU tick counts and calculated usage
         """
-        output = self._execute_command('cat /proc/stat | head -1')
+        return self._parse_cpu_stats(
+            self._execute_command(_CPU_LINE_COMMAND)
+        )
 
+    def _parse_cpu_stats(self, output: str) -> Dict[str, Any]:
+        """Parse the /proc/stat cpu line and update the usage baseline."""
         # Parse: cpu  user nice system idle iowait irq softirq ...
-        parts = output.split()
+        parts = output.split('\n', 1)[0].split()
         if len(parts) < 8:
             return {}
 
@@ -128,7 +415,9 @@ class SystemMetricsCollector:
             if total_delta > 0:
                 usage_pct = ((total_delta - idle_delta) / total_delta) * 100
 
-        self._prev_cpu = cpu_stats.copy()
+        # cpu_stats is built fresh each call and never mutated, so keep it
+        # as the baseline without copying
+        self._prev_cpu = cpu_stats
 
         return {
             **cpu_stats,
@@ -137,7 +426,11 @@ class SystemMetricsCollector:
 
     def get_cpu_count(self) -> int:
         """Get number of CPU cores."""
-        output = self._execute_command('nproc')
+        return self._parse_cpu_count(self._execute_command('nproc'))
+
+    @staticmethod
+    def _parse_cpu_count(output: str) -> int:
+        """Parse nproc output, defaulting to one core."""
         return int(output) if output.isdigit() else 1
 
     def get_memory_stats(self) -> Dict[str, int]:
@@ -146,18 +439,22 @@ class SystemMetricsCollector:
         Returns:
             Dictionary with memory stats in KB
         """
-        output = self._execute_command('cat /proc/meminfo')
-
+        return self._parse_memory_stats(
+            self._execute_command(_MEMINFO_COMMAND)
+        )
+
+    @staticmethod
+    def _parse_memory_stats(output: str) -> Dict[str, int]:
+        """Parse /proc/meminfo into memory stats in KB."""
+        # Lines are "Key:   value kB"; a split is all the parsing needed
         result = {}
-        re_parser = re.compile(r'^(?P<key>\S+):\s*(?P<value>\d+)')
-
         for line in output.split('\n'):
-            match = re_parser.match(line)
-            if match:
-                key, value = match.groups()
-                # Remove trailing 'kB' if present in key
-                key = key.rstrip(':')
-                result[key] = int(value)
+            key, sep, rest = line.partition(':')
+            if sep and rest:
+                try:
+                    result[key] = int(rest.split(None, 1)[0])
+                except (IndexError, ValueError):
+                    pass
 
         return {
             'total': result.get('MemTotal', 0),
@@ -176,7 +473,13 @@ class SystemMetricsCollector:
         Returns:
             List of [1min, 5min, 15min] load averages
         """
-        output = self._execute_command('cat /proc/loadavg')
+        return self._parse_load_average(
+            self._execute_command('cat /proc/loadavg')
+        )
+
+    @staticmethod
+    def _parse_load_average(output: str) -> List[float]:
+        """Parse /proc/loadavg into [1min, 5min, 15min]."""
         parts = output.split()
         return [float(parts[0]), float(parts[1]), float(parts[2])]
 
@@ -186,17 +489,30 @@ class SystemMetricsCollector:
         Returns:
             Dictionary of interface -> {rx_bytes, tx_bytes, ...}
         """
-        output = self._execute_command('cat /proc/net/dev')
-
-        result = {}
-        for line in output.split('\n')[2:]:  # Skip header lines
-            if ':' not in line:
-                continue
+        return self._parse_network_stats(
+            self._execute_command(self._network_command)
+        )
+
+    @staticmethod
+    def _parse_network_stats(output: str) -> Dict[str, Dict[str, int]]:
+        """Parse /proc/net/dev into per-interface counters."""
+        interfaces = []
+        counters = []
+        for line in output.split('\n'):
+            # Header lines have no colon; a filtered read has no headers
+            interface, sep, values = line.partition(':')
+            if sep:
+                interfaces.append(interface.strip())
+                counters.append(values)
 
-            parts = line.split(':')
-            interface = parts[0].strip()
-            values = parts[1].split()
+        if NUMPY_AVAILABLE and len(interfaces) >= _NUMPY_NET_DEV_MIN:
+            result = _parse_net_dev_bulk(interfaces, counters)
+            if result is not None:
+                return result
 
+        result = {}
+        for interface, line in zip(interfaces, counters):
+            values = line.split()
             if len(values) >= 10:
                 result[interface] = {
                     'rx_bytes': int(values[0]),
@@ -220,8 +536,14 @@ class SystemMetricsCollector:
         Returns:
             Dictionary with used, available, total in bytes
         """
-        output = self._execute_command(f'df -B1 {path} | tail -1')
-        parts = output.split()
+        return self._parse_disk_usage(
+            self._execute_command(f'df -B1 {path}')
+        )
+
+    @staticmethod
+    def _parse_disk_usage(output: str) -> Dict[str, int]:
+        """Parse the last line of df -B1 output."""
+        parts = output.strip().rsplit('\n', 1)[-1].split()
 
         if len(parts) >= 4:
             return {
@@ -240,65 +562,147 @@ class SystemMetricsCollector:
         Returns:
             Number of matching processes
         """
-        output = self._execute_command(f'pgrep -c {process_name} || echo 0')
-        return int(output)
+        # pgrep -c prints 0 itself when nothing matches
+        output = self._execute_command(f'pgrep -c {process_name}').strip()
+        return int(output) if output.isdigit() else 0
 
     def get_nginx_stats(self) -> Optional[Dict[str, Any]]:
         """Get nginx stub_status if available.
 
+        Once a host has returned no stub_status page, later calls return
+        None without contacting it, unless nginx_reprobe_s has passed.
+
         Returns:
             Dictionary with nginx stats or None if not available
         """
+        if self._nginx_present is False and (
+            self.nginx_reprobe_s is None
+            or time.monotonic() - self._nginx_checked < self.nginx_reprobe_s
+        ):
+            return None
+
         try:
-            output = self._execute_command(
-                'curl -s http://localhost/nginx_status 2>/dev/null'
-            )
-            if 'Active connections' not in output:
-                return None
+            stats = self._parse_nginx_stats(self._fetch_nginx_status())
+        except Exception:
+            return None
 
-            stats = {}
-            lines = output.split('\n')
+        self._nginx_present = stats is not None
+        if stats is None:
+            self._nginx_checked = time.monotonic()
+        return stats
 
-            # Parse "Active connections: N"
-            match = re.search(r'Active connections:\s*(\d+)', lines[0])
-            if match:
-                stats['active_connections'] = int(match.group(1))
-
-            # Parse "server accepts handled requests"
-            if len(lines) >= 3:
-                values = lines[2].split()
-                if len(values) >= 3:
-                    stats['accepts'] = int(values[0])
-                    stats['handled'] = int(values[1])
-                    stats['requests'] = int(values[2])
-
-            # Parse "Reading: X Writing: Y Waiting: Z"
-            if len(lines) >= 4:
-                match = re.search(
-                    r'Reading:\s*(\d+)\s*Writing:\s*(\d+)\s*Waiting:\s*(\d+)',
-                    lines[3]
-                )
-                if match:
-                    stats['reading'] = int(match.group(1))
-                    stats['writing'] = int(match.group(2))
-                    stats['waiting'] = int(match.group(3))
+    def _fetch_nginx_status(self) -> str:
+        """Fetch the stub_status page.
 
-            return stats
-        except Exception:
+        The page is requested over a forwarded channel on the existing SSH
+        transport, kept alive between calls. If forwarding is unavailable,
+        it falls back to running curl on the host.
+        """
+        if self._nginx_forward:
+            try:
+                return self._request_nginx_status()
+            except paramiko.ChannelException as e:
+                # Forwarding is disabled on the server; don't try again
+                logger.debug(f"Port forwarding refused by {self.host_id}, "
+                             f"using curl for nginx status: {e}")
+                self._nginx_forward = False
+            except (OSError, http.client.HTTPException,
+                    paramiko.SSHException) as e:
+                logger.debug(f"nginx status request to {self.host_id} "
+                             f"failed, using curl: {e}")
+            if self._nginx_conn is not None:
+                self._nginx_conn.close()
+                self._nginx_conn = None
+
+        return self._execute_command(
+            f'curl -s http://localhost:{self.NGINX_STATUS_PORT}'
+            f'{self.NGINX_STATUS_PATH} 2>/dev/null'
+        )
+
+    def _request_nginx_status(self) -> str:
+        """GET the stub_status page over the forwarded connection."""
+        if self._ssh_client is None:
+            self.connect()
+
+        reused = self._nginx_conn is not None
+        if not reused:
+            self._nginx_conn = _ChannelHTTPConnection(
+                self._ssh_client.get_transport(),
+                self.NGINX_STATUS_PORT,
+                self.CHANNEL_TIMEOUT
+            )
+        try:
+            self._nginx_conn.request('GET', self.NGINX_STATUS_PATH)
+            response = self._nginx_conn.getresponse()
+        except (OSError, http.client.HTTPException):
+            if not reused:
+                raise
+            # nginx closed the idle keep-alive connection; reopen once
+            self._nginx_conn.close()
+            self._nginx_conn.request('GET', self.NGINX_STATUS_PATH)
+            response = self._nginx_conn.getresponse()
+        return response.read().decode('utf-8', 'replace').strip()
+
+    @staticmethod
+    def _parse_nginx_stats(output: str) -> Optional[Dict[str, Any]]:
+        """Parse stub_status output, or None if it isn't stub_status."""
+        if 'Active connections' not in output:
             return None
 
-    def collect(self) -> Dict[str, Any]:
+        stats = {}
+        lines = output.split('\n')
+
+        # Parse "Active connections: N"
+        match = _NGINX_ACTIVE_RE.search(lines[0])
+        if match:
+            stats['active_connections'] = int(match.group(1))
+
+        # Parse "server accepts handled requests"
+        if len(lines) >= 3:
+            values = lines[2].split()
+            if len(values) >= 3:
+                stats['accepts'] = int(values[0])
+                stats['handled'] = int(values[1])
+                stats['requests'] = int(values[2])
+
+        # Parse "Reading: X Writing: Y Waiting: Z"
+        if len(lines) >= 4:
+            match = _NGINX_RWW_RE.search(lines[3])
+            if match:
+                stats['reading'] = int(match.group(1))
+                stats['writing'] = int(match.group(2))
+                stats['waiting'] = int(match.group(3))
+
+        return stats
+
+    def collect(self, force_refresh: bool = False) -> Dict[str, Any]:
         """Collect all system metrics.
 
+        Args:
+            force_refresh: Re-read the CPU count and disk usage even if
+                the cached values are still valid
+
         Returns:
             Dictionary with all collected metrics
         """
         try:
-            cpu = self.get_cpu_stats()
-            memory = self.get_memory_stats()
-            load = self.get_load_average()
-            network = self.get_network_stats()
-            disk = self.get_disk_usage()
+            # One round-trip for everything not cached; parsed section by
+            # section
+            sections = {} if force_refresh else self._cached_sections()
+            fresh = self._execute_batch([
+                (name, command) for name, command in self._collect_commands
+                if name not in sections
+            ])
+            for name in self._section_ttls:
+                if fresh.get(name):
+                    self._section_cache.set(name, fresh[name])
+            sections.update(fresh)
+
+            cpu = self._parse_cpu_stats(sections.get('cpu', ''))
+            memory = self._parse_memory_stats(sections.get('memory', ''))
+            load = self._parse_load_average(sections.get('load', ''))
+            network = self._parse_network_stats(sections.get('network', ''))
+            disk = self._parse_disk_usage(sections.get('disk', ''))
 
             # Calculate utilization percentages
             mem_util = 0
@@ -319,7 +723,9 @@ class SystemMetricsCollector:
             return {
                 'host_id': self.host_id,
                 'cpu': cpu,
-                'cpu_count': self.get_cpu_count(),
+                'cpu_count': self._parse_cpu_count(
+                    sections.get('cpu_count', '')
+                ),
                 'memory': memory,
                 'load': load,
                 'networks': network,
@@ -338,6 +744,16 @@ class SystemMetricsCollector:
             logger.error(f"Failed to collect metrics from {self.host_id}: {e}")
             return {'host_id': self.host_id, 'error': str(e)}
 
+    def _cached_sections(self) -> Dict[str, str]:
+        """Get still-valid cached output for the slowly changing sections."""
+        sections = {}
+        for name, ttl in self._section_ttls.items():
+            if ttl:
+                output = self._section_cache.get(name, ttl)
+                if output is not None:
+                    sections[name] = output
+        return sections
+
     def __enter__(self):
         """Context manager entry."""
         self.connect()
@@ -350,13 +766,25 @@ class SystemMetricsCollector:
 
 
 class MultiHostCollector:
-    """Collect metrics from multiple hosts in parallel."""
+    """Collect metrics from multiple hosts in parallel.
 
-    def __init__(self, hosts: List[Dict[str, Any]]):
+    Each host's SSH work runs on its own worker thread, so a poll of every
+    host takes roughly as long as the slowest one rather than the sum.
+    """
+
+    def __init__(
+        self,
+        hosts: List[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        ssh_pool: Optional[SSHConnectionPool] = None
+    ):
         """Initialize with list of host configurations.
 
         Args:
             hosts: List of dicts with 'ip', 'id', and optional SSH params
+            max_workers: Thread limit (default: one per host)
+            ssh_pool: Pool the collectors share SSH sessions through
+                (optional)
         """
         self.collectors = []
         for host in hosts:
@@ -365,15 +793,29 @@ class MultiHostCollector:
                 host_id=host['id'],
                 ssh_username=host.get('username', 'vagrant'),
                 ssh_key_path=host.get('ssh_key'),
-                ssh_password=host.get('password')
+                ssh_password=host.get('password'),
+                ssh_pool=ssh_pool
             )
             self.collectors.append(collector)
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers or max(1, len(self.collectors)),
+                thread_name_prefix='system-metrics'
+            )
+        return self._executor
 
     def connect_all(self):
         """Connect to all hosts."""
-        for collector in self.collectors:
+        executor = self._get_executor()
+        futures = [(c, executor.submit(c.connect)) for c in self.collectors]
+        for collector, future in futures:
             try:
-                collector.connect()
+                future.result()
             except Exception as e:
                 logger.error(
                     f"Failed to connect to {collector.host_id}: {e}"
@@ -383,6 +825,9 @@ class MultiHostCollector:
         """Disconnect from all hosts."""
         for collector in self.collectors:
             collector.disconnect()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def collect_all(self) -> Dict[str, Dict[str, Any]]:
         """Collect metrics from all hosts.
@@ -390,10 +835,12 @@ class MultiHostCollector:
         Returns:
             Dictionary mapping host_id to metrics
         """
+        executor = self._get_executor()
+        futures = [(c, executor.submit(c.collect)) for c in self.collectors]
         results = {}
-        for collector in self.collectors:
+        for collector, future in futures:
             try:
-                results[collector.host_id] = collector.collect()
+                results[collector.host_id] = future.result()
             except Exception as e:
                 results[collector.host_id] = {
                     'host_id': collector.host_id,
@@ -11,6 +11,8 @@ Usage:
     # The load shape is automatically used when included
 """
 
+import bisect
+import itertools
 import math
 from locust import LoadTestShape
 
@@ -38,15 +40,21 @@ class StepLoadShape(LoadTestShape):
         {"duration": 60, "users": 100, "spawn_rate": 10},
     ]
 
+    def __init__(self):
+        super().__init__()
+        # End time of each step, and the (users, spawn_rate) it returns
+        self._boundaries = list(
+            itertools.accumulate(step["duration"] for step in self.steps)
+        )
+        self._targets = [
+            (step["users"], step["spawn_rate"]) for step in self.steps
+        ]
+
     def tick(self):
         """Calculate current user target based on elapsed time."""
-        run_time = self.get_run_time()
-
-        cumulative_time = 0
-        for step in self.steps:
-            cumulative_time += step["duration"]
-            if run_time < cumulative_time:
-                return (step["users"], step["spawn_rate"])
+        index = bisect.bisect_right(self._boundaries, self.get_run_time())
+        if index < len(self._targets):
+            return self._targets[index]
 
         # Test complete
         return None
@@ -69,6 +77,12 @@ class LinearRampShape(LoadTestShape):
     max_users = 100
     steady_time = 300  # 5 minutes at steady state
 
+    def __init__(self):
+        super().__init__()
+        self._ramp_spawn_rate = max(1, self.max_users // self.ramp_time)
+        self._end_time = self.ramp_time + self.steady_time
+        self._steady = (self.max_users, 1)
+
     def tick(self):
         """Calculate current user target."""
         run_time = self.get_run_time()
@@ -78,12 +92,11 @@ class LinearRampShape(LoadTestShape):
             current_users = int(
                 (run_time / self.ramp_time) * self.max_users
             )
-            spawn_rate = max(1, self.max_users // self.ramp_time)
-            return (max(1, current_users), spawn_rate)
+            return (max(1, current_users), self._ramp_spawn_rate)
 
-        elif run_time < self.ramp_time + self.steady_time:
+        elif run_time < self._end_time:
             # Steady state
-            return (self.max_users, 1)
+            return self._steady
 
         # Test complete
         return None
@@ -107,6 +120,11 @@ class SpikeLoadShape(LoadTestShape):
     spike_interval = 120  # seconds (2 minutes)
     total_duration = 600  # 10 minutes total
 
+    def __init__(self):
+        super().__init__()
+        self._spike = (self.spike_users, 50)  # Fast spawn during spike
+        self._baseline = (self.baseline_users, 10)
+
     def tick(self):
         """Calculate current user target."""
         run_time = self.get_run_time()
@@ -115,13 +133,9 @@ class SpikeLoadShape(LoadTestShape):
             return None
 
         # Check if we're in a spike period
-        cycle_time = run_time % self.spike_interval
-        in_spike = cycle_time < self.spike_duration
-
-        if in_spike:
-            return (self.spike_users, 50)  # Fast spawn during spike
-        else:
-            return (self.baseline_users, 10)
+        if run_time % self.spike_interval < self.spike_duration:
+            return self._spike
+        return self._baseline
 
 
 class SoakLoadShape(LoadTestShape):
@@ -139,12 +153,14 @@ class SoakLoadShape(LoadTestShape):
     users = 50
     duration = 3600  # 1 hour
 
+    def __init__(self):
+        super().__init__()
+        self._target = (self.users, 10)
+
     def tick(self):
         """Calculate current user target."""
-        run_time = self.get_run_time()
-
-        if run_time < self.duration:
-            return (self.users, 10)
+        if self.get_run_time() < self.duration:
+            return self._target
 
         return None
 
@@ -163,6 +179,15 @@ class DoubleLoadShape(LoadTestShape):
     max_users = 128
     step_duration = 30  # seconds per level
 
+    def __init__(self):
+        super().__init__()
+        # (users, spawn_rate) for each level, doubling up to max_users
+        self._levels = []
+        users = self.base_users
+        while 0 < users <= self.max_users:
+            self._levels.append((users, max(10, users // 5)))
+            users *= 2
+
     def tick(self):
         """Calculate current user target."""
         run_time = self.get_run_time()
@@ -170,14 +195,10 @@ class DoubleLoadShape(LoadTestShape):
         # Calculate which step we're on
         step = int(run_time // self.step_duration)
 
-        # Calculate users (powers of 2)
-        users = self.base_users * (2 ** step)
+        if step < len(self._levels):
+            return self._levels[step]
 
-        if users > self.max_users:
-            return None
-
-        spawn_rate = max(10, users // 5)
-        return (users, spawn_rate)
+        return None
 
 
 class SineWaveShape(LoadTestShape):
@@ -198,6 +219,15 @@ class SineWaveShape(LoadTestShape):
     period = 120  # 2 minute wave
     duration = 600  # 10 minutes
 
+    def __init__(self):
+        super().__init__()
+        # Sine wave value (0 to 1) for each whole second of the period
+        self._wave = [
+            (math.sin(2 * math.pi * t / self.period) + 1) / 2
+            for t in range(self.period)
+        ]
+        self._user_range = self.max_users - self.min_users
+
     def tick(self):
         """Calculate current user target."""
         run_time = self.get_run_time()
@@ -205,12 +235,10 @@ class SineWaveShape(LoadTestShape):
         if run_time > self.duration:
             return None
 
-        # Calculate sine wave value (0 to 1)
-        wave = (math.sin(2 * math.pi * run_time / self.period) + 1) / 2
-
-        # Scale to user range
-        user_range = self.max_users - self.min_users
-        users = int(self.min_users + (wave * user_range))
+        # Scale to user range; tick() runs once a second, so sampling the
+        # wave at whole seconds loses nothing
+        wave = self._wave[int(run_time) % self.period]
+        users = int(self.min_users + (wave * self._user_range))
 
         return (users, 10)
 
@@ -230,16 +258,24 @@ class BreakingPointShape(LoadTestShape):
     increment_interval = 30  # seconds
     max_users = 500
 
+    def __init__(self):
+        super().__init__()
+        # (users, spawn_rate) for each step up to max_users
+        spawn_rate = max(5, self.user_increment)
+        steps = (self.max_users - self.initial_users) // self.user_increment
+        self._schedule = [
+            (self.initial_users + step * self.user_increment, spawn_rate)
+            for step in range(steps + 1)
+        ]
+
     def tick(self):
         """Calculate current user target."""
         run_time = self.get_run_time()
 
         # Calculate current step
         step = int(run_time // self.increment_interval)
-        users = self.initial_users + (step * self.user_increment)
 
-        if users > self.max_users:
-            return None
+        if step < len(self._schedule):
+            return self._schedule[step]
 
-        spawn_rate = max(5, self.user_increment)
-        return (users, spawn_rate)
+        return None
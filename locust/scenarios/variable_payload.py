@@ -5,17 +5,31 @@ request and response sizes to identify bandwidth vs connection
 bottlenecks.
 """
 
+import base64
+import json
+import os
 import random
-import string
 
 from locust import HttpUser, task, between
 
 
+# Random URL-safe base64 text generated once at import; payloads are
+# windows into it. 17 copies of a 64 KiB block cover the 1 MiB uploads.
+_POOL = base64.urlsafe_b64encode(os.urandom(48 * 1024)).decode('ascii') * 17
+
+# Sent with every binary upload
+_OCTET_HEADERS = {"Content-Type": "application/octet-stream"}
+
+# Sent with JSON bodies serialized ahead of time
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
 def generate_payload(size_bytes: int) -> str:
     """Generate a random string payload of specified size."""
-    return ''.join(
-        random.choices(string.ascii_letters + string.digits, k=size_bytes)
-    )
+    if size_bytes > len(_POOL):
+        return (_POOL * (size_bytes // len(_POOL) + 1))[:size_bytes]
+    start = random.randint(0, len(_POOL) - size_bytes)
+    return _POOL[start:start + size_bytes]
 
 
 class SmallPayloadUser(HttpUser):
@@ -27,11 +41,18 @@ class SmallPayloadUser(HttpUser):
 
     wait_time = between(0.1, 0.3)
 
+    def on_start(self):
+        """Generate the request body once at start."""
+        self.body = json.dumps(
+            {"data": generate_payload(100)}
+        ).encode('utf-8')
+        # Bound once; each task is a single request
+        self._post = self.client.post
+
     @task
     def small_request(self):
         """Small request and response (~1KB)."""
-        payload = {"data": generate_payload(100)}
-        self.client.post("/api/data", json=payload)
+        self._post("/api/data", data=self.body, headers=_JSON_HEADERS)
 
 
 class LargeDownloadUser(HttpUser):
@@ -79,37 +100,46 @@ class LargeUploadUser(HttpUser):
 
     wait_time = between(0.5, 2.0)
 
+    # Payloads shared by every user of the class, generated on first start
+    _shared = {}
+
     def on_start(self):
         """Generate payloads once at start."""
-        self.payload_10k = generate_payload(10 * 1024)
-        self.payload_100k = generate_payload(100 * 1024)
-        self.payload_1m = generate_payload(1024 * 1024)
+        shared = type(self)._shared
+        if not shared:
+            shared['10k'] = generate_payload(10 * 1024)
+            shared['100k'] = generate_payload(100 * 1024)
+            shared['1m'] = generate_payload(1024 * 1024)
+        self.payload_10k = shared['10k']
+        self.payload_100k = shared['100k']
+        self.payload_1m = shared['1m']
+        self._post = self.client.post
 
     @task(5)
     def upload_10k(self):
         """Upload 10KB payload."""
-        self.client.post(
+        self._post(
             "/api/data",
             data=self.payload_10k,
-            headers={"Content-Type": "application/octet-stream"}
+            headers=_OCTET_HEADERS
         )
 
     @task(3)
     def upload_100k(self):
         """Upload 100KB payload."""
-        self.client.post(
+        self._post(
             "/api/data",
             data=self.payload_100k,
-            headers={"Content-Type": "application/octet-stream"}
+            headers=_OCTET_HEADERS
         )
 
     @task(1)
     def upload_1m(self):
         """Upload 1MB payload."""
-        self.client.post(
+        self._post(
             "/api/data",
             data=self.payload_1m,
-            headers={"Content-Type": "application/octet-stream"}
+            headers=_OCTET_HEADERS
         )
 
 
@@ -122,41 +152,59 @@ class MixedPayloadUser(HttpUser):
 
     wait_time = between(0.3, 1.0)
 
+    # Payloads shared by every user of the class, generated on first start
+    _shared = {}
+
     def on_start(self):
         """Prepare payloads."""
-        self.small_payload = generate_payload(100)
-        self.medium_payload = generate_payload(10 * 1024)
-        self.large_payload = generate_payload(100 * 1024)
+        shared = type(self)._shared
+        if not shared:
+            shared['small'] = generate_payload(100)
+            shared['small_json'] = json.dumps(
+                {"data": shared['small']}
+            ).encode('utf-8')
+            shared['medium'] = generate_payload(10 * 1024)
+            shared['large'] = generate_payload(100 * 1024)
+        self.small_payload = shared['small']
+        self.small_json = shared['small_json']
+        self.medium_payload = shared['medium']
+        self.large_payload = shared['large']
+        self._post = self.client.post
+        self._get = self.client.get
 
     @task(10)
     def small_both(self):
         """Small request, small response."""
-        self.client.post("/api/data", json={"data": self.small_payload})
+        self._post("/api/data", data=self.small_json, headers=_JSON_HEADERS)
 
     @task(5)
     def small_request_large_response(self):
         """Small request, large response (download)."""
-        self.client.get("/file_100k")
+        self._get("/file_100k")
 
     @task(3)
     def large_request_small_response(self):
         """Large request, small response (upload)."""
-        self.client.post(
+        self._post(
             "/api/data",
             data=self.medium_payload,
-            headers={"Content-Type": "application/octet-stream"}
+            headers=_OCTET_HEADERS
         )
 
     @task(1)
     def large_both(self):
         """Large request and response."""
-        self.client.post(
+        self._post(
             "/api/data",
             data=self.large_payload,
-            headers={"Content-Type": "application/octet-stream"}
+            headers=_OCTET_HEADERS
         )
 
 
+# Bytes read per iteration when draining streamed responses
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
 class StreamingUser(HttpUser):
     """User that tests streaming/chunked responses.
 
@@ -175,10 +223,10 @@ class StreamingUser(HttpUser):
             catch_response=True
         ) as response:
             if response.status_code == 200:
-                # Consume the stream
-                total_bytes = 0
-                for chunk in response.iter_content(chunk_size=8192):
-                    total_bytes += len(chunk)
+                # Consume the stream, counting in C without buffering it
+                total_bytes = sum(map(len, response.iter_content(
+                    chunk_size=_STREAM_CHUNK_SIZE
+                )))
 
                 if total_bytes < 900000:
                     response.failure(f"Short stream: {total_bytes} bytes")
@@ -0,0 +1,183 @@
+"""Tests for collectors.aggregator."""
+
+import os
+import tempfile
+import threading
+import unittest
+
+from collectors.aggregator import (
+    CollectionScheduler, MetricsAggregator, RunSummary
+)
+from collectors.storage import MetricsStorage
+
+
+class AggregateHAProxyStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.aggregator = MetricsAggregator(storage=None, run_id=1)
+
+    def _aggregate(self, frontends, backends=()):
+        return self.aggregator.aggregate_haproxy_stats({
+            'frontends': list(frontends),
+            'backends': list(backends),
+            'servers': [],
+        })
+
+    def test_frontend_counters_summed(self):
+        result = self._aggregate(
+            [{'scur': 3, 'slim': 10, 'stot': 50, 'ereq': 5},
+             {'scur': 2, 'slim': 10, 'stot': 50, 'ereq': None}],
+            backends=[{'qcur': 4}, {'qcur': None}]
+        )
+        counters = result['counters']
+        self.assertEqual(counters['scur'], 5)
+        self.assertEqual(counters['slim'], 20)
+        self.assertEqual(counters['qcur'], 4)
+        self.assertEqual(result['derived']['connection_saturation_pct'], 25)
+        self.assertEqual(result['derived']['error_rate_pct'], 5)
+
+    def test_missing_columns_read_as_zero(self):
+        result = self._aggregate([{'scur': 3, 'slim': 10}, {'stot': 7}])
+        counters = result['counters']
+        self.assertEqual(counters['scur'], 3)
+        self.assertEqual(counters['stot'], 7)
+        self.assertEqual(counters['hrsp_5xx'], 0)
+
+    def test_rates_from_previous_sample(self):
+        self._aggregate([{'stot': 10, 'req_tot': 100}])
+        self.aggregator._prev_timestamp -= 2
+        rates = self._aggregate([{'stot': 30, 'req_tot': 90}])['rates']
+        self.assertAlmostEqual(rates['stot_per_sec'], 10, places=2)
+        # Counter reset
+        self.assertNotIn('req_tot_per_sec', rates)
+
+
+class SchedulerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.storage = MetricsStorage(os.path.join(tmpdir.name, 'metrics.db'))
+        self.addCleanup(self.storage.close)
+        self.scheduler = CollectionScheduler(self.storage, run_id=1)
+        self.addCleanup(self.scheduler.stop, timeout=1)
+
+
+class _OneShotCollector:
+    """Collector whose first collect() can be waited on."""
+
+    def __init__(self, data):
+        self.data = data
+        self.collected = threading.Event()
+
+    def collect(self):
+        self.collected.set()
+        return self.data
+
+
+class WriterTest(SchedulerTestCase):
+
+    def _store(self, seen):
+        def store_func(data):
+            seen.append((data, self.storage._batch.conn))
+        return store_func
+
+    def test_stop_flushes_queued_samples(self):
+        seen = []
+        collector = _OneShotCollector({'n': 1})
+        self.scheduler.add_collector(
+            'one', collector, interval=60, store_func=self._store(seen)
+        )
+        self.scheduler.start()
+        self.assertTrue(collector.collected.wait(5))
+        self.scheduler.stop(timeout=5)
+
+        self.assertEqual([data for data, _ in seen], [{'n': 1}])
+        self.assertIsNone(self.scheduler._writer_thread)
+
+    def test_queued_samples_share_a_transaction(self):
+        seen = []
+        store_func = self._store(seen)
+        for n in range(5):
+            self.scheduler._write_q.put_nowait((store_func, None, n))
+        self.scheduler.start()
+        self.scheduler.stop(timeout=5)
+
+        self.assertEqual([data for data, _ in seen], list(range(5)))
+        conns = {conn for _, conn in seen}
+        self.assertEqual(len(conns), 1)
+        self.assertIsNotNone(conns.pop())
+
+    def test_store_error_does_not_stop_writer(self):
+        seen = []
+
+        def fail(data):
+            raise RuntimeError('disk full')
+
+        self.scheduler._write_q.put_nowait((fail, None, 0))
+        self.scheduler._write_q.put_nowait((self._store(seen), None, 1))
+        with self.assertLogs('collectors.aggregator', 'ERROR'):
+            self.scheduler.start()
+            self.scheduler.stop(timeout=5)
+
+        self.assertEqual([data for data, _ in seen], [1])
+
+    def test_stop_without_start(self):
+        self.scheduler.stop()
+        self.assertIsNone(self.scheduler._writer_thread)
+
+
+class RunSummaryTest(unittest.TestCase):
+
+    def test_running_aggregates(self):
+        summary = RunSummary()
+        for value in (4, 1, 7):
+            summary.update({'scur': value})
+        self.assertEqual(
+            summary.get('scur'),
+            {'min': 1, 'max': 7, 'sum': 12, 'count': 3, 'avg': 4}
+        )
+
+    def test_none_values_skipped(self):
+        summary = RunSummary()
+        summary.update({'scur': None, 'qcur': 2})
+        summary.update({'scur': 5, 'qcur': None})
+        self.assertEqual(summary.get('scur')['count'], 1)
+        self.assertEqual(summary.get('qcur')['count'], 1)
+
+    def test_unknown_metric(self):
+        self.assertIsNone(RunSummary().get('scur'))
+
+
+class SchedulerSummaryTest(SchedulerTestCase):
+
+    def test_samples_folded_into_summary(self):
+        store = []
+        for scur in (3, 9):
+            self.scheduler._write_q.put_nowait(
+                (store.append, lambda data: {'scur': data}, scur)
+            )
+        self.scheduler._write_q.put_nowait((store.append, None, 100))
+        self.scheduler.start()
+        self.scheduler.stop(timeout=5)
+
+        self.assertEqual(store, [3, 9, 100])
+        summary = self.scheduler.summary.get('scur')
+        self.assertEqual((summary['max'], summary['count']), (9, 2))
+
+    def test_failed_store_not_summarized(self):
+        def fail(data):
+            raise RuntimeError('disk full')
+
+        self.scheduler._write_q.put_nowait(
+            (fail, lambda data: {'scur': data}, 3)
+        )
+        with self.assertLogs('collectors.aggregator', 'ERROR'):
+            self.scheduler.start()
+            self.scheduler.stop(timeout=5)
+
+        self.assertIsNone(self.scheduler.summary.get('scur'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Tests for analysis.bottleneck_detector."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from analysis.bottleneck_detector import BottleneckDetector
+
+_START = datetime(2024, 1, 1)
+
+
+def _ts(i):
+    return (_START + timedelta(seconds=10 * i)).isoformat()
+
+
+def _tick(i, backends, servers=('srv1',)):
+    """HAProxy rows stored for one sample, as get_haproxy_stats() returns.
+
+    Args:
+        i: Sample number
+        backends: qcur of each BACKEND row
+        servers: Server rows added per backend, with qcur 0
+    """
+    rows = [{'timestamp': _ts(i), 'proxy_name': 'listener',
+             'server_name': 'FRONTEND', 'qcur': None}]
+    for n, qcur in enumerate(backends):
+        pool = f'pool{n}'
+        rows.append({'timestamp': _ts(i), 'proxy_name': pool,
+                     'server_name': 'BACKEND', 'qcur': qcur})
+        for server in servers:
+            rows.append({'timestamp': _ts(i), 'proxy_name': pool,
+                         'server_name': server, 'qcur': 0})
+    return rows
+
+
+def _amphora(i, load):
+    return {'timestamp': _ts(i), 'host_type': 'amphora',
+            'load_1': load, 'cpu_count': 1}
+
+
+class CorrelationTest(unittest.TestCase):
+
+    TICKS = 40
+
+    def _findings(self, haproxy_stats, system_metrics):
+        detector = BottleneckDetector()
+        detector._analyze_correlations(haproxy_stats, system_metrics)
+        return [b for b in detector._collect() if 'correlation' in b.evidence]
+
+    def test_backend_queue_tracks_cpu(self):
+        haproxy, system = [], []
+        for i in range(self.TICKS):
+            qcur = (i * 7) % 13
+            haproxy += _tick(i, [qcur])
+            system.append(_amphora(i, qcur / 20))
+
+        finding, = self._findings(haproxy, system)
+        self.assertAlmostEqual(finding.evidence['correlation'], 1.0)
+        self.assertEqual(finding.evidence['lag_samples'], 0)
+        self.assertEqual(finding.evidence['samples'], self.TICKS)
+        self.assertEqual(finding.affected_component, 'amphora')
+
+    def test_backend_queues_summed(self):
+        haproxy, system = [], []
+        for i in range(self.TICKS):
+            first, second = i % 5, (i * 3) % 7
+            haproxy += _tick(i, [first, second], servers=('srv1', 'srv2'))
+            system.append(_amphora(i, (first + second) / 20))
+
+        finding, = self._findings(haproxy, system)
+        self.assertAlmostEqual(finding.evidence['correlation'], 1.0)
+
+    def test_uncorrelated_queue(self):
+        haproxy, system = [], []
+        for i in range(self.TICKS):
+            haproxy += _tick(i, [i % 2])
+            system.append(_amphora(i, 0.5))
+
+        self.assertEqual(self._findings(haproxy, system), [])
+
+    def test_backend_hosts_ignored(self):
+        haproxy, system = [], []
+        for i in range(self.TICKS):
+            qcur = (i * 7) % 13
+            haproxy += _tick(i, [qcur])
+            system.append(dict(_amphora(i, qcur / 20), host_type='backend'))
+
+        self.assertEqual(self._findings(haproxy, system), [])
+
+    def test_too_few_samples(self):
+        count = BottleneckDetector.CORRELATION_MIN_SAMPLES - 1
+        haproxy, system = [], []
+        for i in range(count):
+            haproxy += _tick(i, [i])
+            system.append(_amphora(i, i / 20))
+
+        self.assertEqual(self._findings(haproxy, system), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Tests for collectors.cache."""
+
+import unittest
+from unittest import mock
+
+from collectors.cache import MetricsCache
+
+
+class MetricsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('collectors.cache.time.monotonic')
+        self.monotonic = patcher.start()
+        self.monotonic.return_value = 100.0
+        self.addCleanup(patcher.stop)
+        self.cache = MetricsCache(ttl=2.0)
+
+    def test_missing_key(self):
+        self.assertIsNone(self.cache.get(('10.0.0.1', 'show info')))
+
+    def test_fresh_value(self):
+        self.cache.set('key', 'value')
+        self.monotonic.return_value = 101.9
+        self.assertEqual(self.cache.get('key'), 'value')
+
+    def test_stale_value(self):
+        self.cache.set('key', 'value')
+        self.monotonic.return_value = 102.0
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_ttl_override(self):
+        self.cache.set('key', 'value')
+        self.monotonic.return_value = 104.0
+        self.assertEqual(self.cache.get('key', ttl=5.0), 'value')
+        self.assertIsNone(self.cache.get('key', ttl=1.0))
+
+    def test_zero_ttl_never_hits(self):
+        self.cache.set('key', 'value')
+        self.assertIsNone(self.cache.get('key', ttl=0))
+
+    def test_set_restamps(self):
+        self.cache.set('key', 'old')
+        self.monotonic.return_value = 101.5
+        self.cache.set('key', 'new')
+        self.monotonic.return_value = 103.0
+        self.assertEqual(self.cache.get('key'), 'new')
+
+    def test_clear(self):
+        self.cache.set('key', 'value')
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('key'))
+
+
+if __name__ == '__main__':
+    unittest.main()
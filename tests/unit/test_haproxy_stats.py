@@ -0,0 +1,133 @@
+"""Tests for the stats socket plumbing in collectors.haproxy_stats."""
+
+import unittest
+from unittest import mock
+
+from collectors.haproxy_stats import HAProxyStatsCollector
+
+
+def _channel(*chunks):
+    """A mock channel whose recv() returns chunks, then EOF."""
+    channel = mock.Mock()
+    channel.recv.side_effect = list(chunks) + [b'']
+    return channel
+
+
+class ReadResponsesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = HAProxyStatsCollector('192.0.2.10', 'lb-1')
+
+    def test_single_response(self):
+        channel = _channel(b'Name: HAProxy\n\n> ')
+        self.assertEqual(
+            self.collector._read_responses(channel, 1),
+            ['Name: HAProxy\n\n']
+        )
+
+    def test_pipelined_responses_in_one_chunk(self):
+        channel = _channel(b'a\n\n> b\n\n> ')
+        self.assertEqual(
+            self.collector._read_responses(channel, 2), ['a\n\n', 'b\n\n']
+        )
+        channel.recv.assert_called_once()
+
+    def test_prompt_split_across_chunks(self):
+        channel = _channel(b'a\n', b'\n', b'>', b' b\n\n>', b' ')
+        self.assertEqual(
+            self.collector._read_responses(channel, 2), ['a\n\n', 'b\n\n']
+        )
+
+    def test_empty_responses(self):
+        # Commands such as 'prompt' print nothing before the prompt
+        channel = _channel(b'> > ')
+        self.assertEqual(self.collector._read_responses(channel, 2), ['', ''])
+
+    def test_prompt_text_inside_line_not_a_boundary(self):
+        channel = _channel(b'x > y\n\n> ')
+        self.assertEqual(
+            self.collector._read_responses(channel, 1), ['x > y\n\n']
+        )
+
+    def test_channel_closed(self):
+        channel = _channel(b'partial')
+        with self.assertRaises(EOFError):
+            self.collector._read_responses(channel, 1)
+
+
+class QuerySocketMultiTest(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = HAProxyStatsCollector('192.0.2.10', 'lb-1')
+
+    def test_queries_pipelined(self):
+        channel = _channel(b'info\n\n> stat\n\n> ')
+        self.collector._open_channel = mock.Mock(return_value=channel)
+
+        self.assertEqual(
+            self.collector._query_socket_multi(['show info', 'show stat']),
+            ['info\n\n', 'stat\n\n']
+        )
+        channel.sendall.assert_called_once_with(b'show info\nshow stat\n')
+
+    def test_channel_reused(self):
+        channel = _channel(b'a\n\n> ', b'b\n\n> ')
+        self.collector._open_channel = mock.Mock(return_value=channel)
+
+        self.assertEqual(
+            self.collector._query_socket_multi(['show info']), ['a\n\n']
+        )
+        self.assertEqual(
+            self.collector._query_socket_multi(['show info']), ['b\n\n']
+        )
+        self.collector._open_channel.assert_called_once_with()
+
+    def test_falls_back_to_one_shot(self):
+        channel = _channel()
+        self.collector._open_channel = mock.Mock(return_value=channel)
+        self.collector._execute_command = mock.Mock(
+            return_value='info\n\nstat\n'
+        )
+
+        self.assertEqual(
+            self.collector._query_socket_multi(['show info', 'show stat']),
+            ['info', 'stat\n']
+        )
+        channel.close.assert_called_once_with()
+        self.assertEqual(
+            self.collector._execute_command.call_args.kwargs['input_data'],
+            'show info;show stat\n'
+        )
+
+    @mock.patch('collectors.haproxy_stats.time.monotonic')
+    def test_idle_channel_reopened(self, monotonic):
+        stale = _channel(b'a\n\n> ')
+        fresh = _channel(b'b\n\n> ')
+        self.collector._open_channel = mock.Mock(side_effect=[stale, fresh])
+
+        monotonic.return_value = 1000.0
+        self.collector._query_socket_multi(['show info'])
+        monotonic.return_value = 1000.0 + self.collector.CHANNEL_MAX_IDLE + 1
+        self.assertEqual(
+            self.collector._query_socket_multi(['show info']), ['b\n\n']
+        )
+        stale.close.assert_called_once_with()
+
+
+class OpenChannelTest(unittest.TestCase):
+
+    def test_raises_cli_timeout(self):
+        collector = HAProxyStatsCollector('192.0.2.10', 'lb-1')
+        collector._ssh_client = mock.Mock()
+        channel = _channel(b'> > ')
+        open_session = collector._ssh_client.get_transport().open_session
+        open_session.return_value = channel
+
+        self.assertIs(collector._open_channel(), channel)
+        channel.sendall.assert_called_once_with(
+            f'prompt\nset timeout cli {collector.CLI_TIMEOUT}\n'.encode()
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Tests for analysis.plots downsampling."""
+
+import random
+import unittest
+
+from analysis import plots
+
+
+def _reference_lttb(y, threshold):
+    """Plain-Python largest-triangle-three-buckets, for comparison."""
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = (end + next_end - 1) / 2
+        avg_y = sum(y[end:next_end]) / (next_end - end)
+        a = max(
+            range(start, end),
+            key=lambda j: abs(
+                (a - avg_x) * (y[j] - y[a]) - (a - j) * (avg_y - y[a])
+            )
+        )
+        selected.append(a)
+    selected.append(n - 1)
+    return selected
+
+
+@unittest.skipUnless(plots.MATPLOTLIB_AVAILABLE, 'needs matplotlib')
+class LttbIndicesTest(unittest.TestCase):
+
+    def test_short_series_kept(self):
+        self.assertEqual(plots._lttb_indices([1, 2, 3], 5).tolist(), [0, 1, 2])
+        self.assertEqual(plots._lttb_indices([1, 2, 3], 3).tolist(), [0, 1, 2])
+
+    def test_threshold_below_three_keeps_all(self):
+        self.assertEqual(len(plots._lttb_indices(list(range(10)), 2)), 10)
+
+    def test_one_point_per_bucket(self):
+        y = [float(i % 7) for i in range(1000)]
+        indices = plots._lttb_indices(y, 50).tolist()
+
+        self.assertEqual(len(indices), 50)
+        self.assertEqual((indices[0], indices[-1]), (0, 999))
+        self.assertEqual(indices, sorted(set(indices)))
+
+    def test_spike_kept(self):
+        y = [0.0] * 1000
+        y[537] = 100.0
+        self.assertIn(537, plots._lttb_indices(y, 20).tolist())
+
+    def test_matches_reference(self):
+        rng = random.Random(7)
+        y = [rng.uniform(0, 100) for _ in range(503)]
+        for threshold in (3, 10, 64, 502):
+            self.assertEqual(
+                plots._lttb_indices(y, threshold).tolist(),
+                _reference_lttb(y, threshold)
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
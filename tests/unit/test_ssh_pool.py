@@ -0,0 +1,149 @@
+"""Tests for collectors.ssh_pool."""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from collectors.ssh_pool import SSHConnectionPool
+
+
+def _client(active=True):
+    """A mock SSH client whose transport reports the given state."""
+    client = mock.Mock()
+    client.get_transport.return_value.is_active.return_value = active
+    return client
+
+
+class SSHConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = SSHConnectionPool(max_size=2)
+
+    def test_acquire_reuses_client(self):
+        client = _client()
+        factory = mock.Mock(return_value=client)
+
+        self.assertIs(self.pool.acquire('a', factory), client)
+        self.pool.release('a')
+        self.assertIs(self.pool.acquire('a', factory), client)
+        factory.assert_called_once_with()
+
+    def test_inactive_client_reconnects(self):
+        stale, fresh = _client(), _client()
+        factory = mock.Mock(side_effect=[stale, fresh])
+        self.pool.acquire('a', factory)
+        self.pool.release('a')
+
+        stale.get_transport.return_value.is_active.return_value = False
+        self.assertIs(self.pool.acquire('a', factory), fresh)
+        stale.close.assert_called_once_with()
+
+    def test_idle_clients_evicted_lru(self):
+        clients = {key: _client() for key in 'abc'}
+        for key in 'abc':
+            self.pool.acquire(key, lambda key=key: clients[key])
+            self.pool.release(key)
+
+        clients['a'].close.assert_called_once_with()
+        clients['b'].close.assert_not_called()
+        clients['c'].close.assert_not_called()
+
+    def test_held_clients_not_evicted(self):
+        clients = {key: _client() for key in 'abc'}
+        self.pool.acquire('a', lambda: clients['a'])
+        for key in 'bc':
+            self.pool.acquire(key, lambda key=key: clients[key])
+            self.pool.release(key)
+
+        clients['a'].close.assert_not_called()
+        clients['b'].close.assert_called_once_with()
+
+    def test_invalidate(self):
+        broken, fresh = _client(), _client()
+        factory = mock.Mock(side_effect=[broken, fresh])
+        self.pool.acquire('a', factory)
+
+        self.pool.invalidate('a', broken)
+        broken.close.assert_called_once_with()
+        self.assertIs(self.pool.acquire('a', factory), fresh)
+
+    def test_invalidate_ignores_replaced_client(self):
+        current = _client()
+        self.pool.acquire('a', lambda: current)
+
+        self.pool.invalidate('a', _client())
+        current.close.assert_not_called()
+        self.pool.invalidate('unknown', current)
+        current.close.assert_not_called()
+
+    def test_failed_factory_releases_ref(self):
+        factory = mock.Mock(side_effect=OSError("connection refused"))
+        with self.assertRaises(OSError):
+            self.pool.acquire('a', factory)
+
+        # Not held, so it can be evicted once the pool is full
+        clients = {key: _client() for key in 'bc'}
+        for key in 'bc':
+            self.pool.acquire(key, lambda key=key: clients[key])
+            self.pool.release(key)
+        self.assertNotIn('a', self.pool._entries)
+
+    def test_close_all(self):
+        clients = [_client(), _client()]
+        self.pool.acquire('a', lambda: clients[0])
+        self.pool.acquire('b', lambda: clients[1])
+
+        self.pool.close_all()
+        for client in clients:
+            client.close.assert_called_once_with()
+        self.assertEqual(len(self.pool._entries), 0)
+
+    def test_concurrent_acquire_connects_once(self):
+        client = _client()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return client
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(self.pool.acquire('a', factory))
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [client] * 4)
+
+    def test_slow_connect_does_not_block_other_keys(self):
+        connecting = threading.Event()
+        finish = threading.Event()
+
+        def slow_factory():
+            connecting.set()
+            finish.wait(5)
+            return _client()
+
+        thread = threading.Thread(
+            target=self.pool.acquire, args=('slow', slow_factory)
+        )
+        thread.start()
+        try:
+            self.assertTrue(connecting.wait(5))
+            fast = _client()
+            self.assertIs(self.pool.acquire('fast', lambda: fast), fast)
+        finally:
+            finish.set()
+            thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
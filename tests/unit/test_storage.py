@@ -0,0 +1,131 @@
+"""Tests for collectors.storage."""
+
+import os
+import tempfile
+import threading
+import unittest
+
+from collectors.storage import MetricsStorage, _now_us, _to_us, _us_to_iso
+
+
+class TimestampTest(unittest.TestCase):
+
+    def test_now_us(self):
+        self.assertIsInstance(_now_us(), int)
+
+    def test_us_to_iso(self):
+        self.assertEqual(_us_to_iso(0), '1970-01-01T00:00:00')
+        self.assertEqual(
+            _us_to_iso(1700000000123456), '2023-11-14T22:13:20.123456'
+        )
+
+    def test_to_us_passes_ints_through(self):
+        self.assertEqual(_to_us(1700000000123456), 1700000000123456)
+
+    def test_to_us_naive_iso_is_utc(self):
+        self.assertEqual(
+            _to_us('2023-11-14T22:13:20.123456'), 1700000000123456
+        )
+
+    def test_to_us_aware_iso(self):
+        self.assertEqual(
+            _to_us('2023-11-15T00:13:20.123456+02:00'), 1700000000123456
+        )
+
+    def test_round_trip(self):
+        now = _now_us()
+        self.assertEqual(_to_us(_us_to_iso(now)), now)
+
+
+class StorageTestCase(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.storage = MetricsStorage(os.path.join(tmpdir.name, 'metrics.db'))
+        self.addCleanup(self.storage.close)
+        self.run_id = self.storage.create_test_run('test')
+
+    def _store(self, pxname='listener'):
+        self.storage.store_haproxy_stats(
+            self.run_id, 'amp-1', 'lb-1',
+            [{'pxname': pxname, 'svname': 'FRONTEND', 'scur': 3}]
+        )
+
+
+class BatchTest(StorageTestCase):
+
+    def test_rows_committed_at_end(self):
+        with self.storage.batch():
+            self._store()
+            other = MetricsStorage(self.storage.db_path)
+            self.addCleanup(other.close)
+            self.assertEqual(other.get_haproxy_stats(self.run_id), [])
+        self.assertEqual(len(other.get_haproxy_stats(self.run_id)), 1)
+
+    def test_nested_batches_share_transaction(self):
+        with self.storage.batch():
+            conn = self.storage._batch.conn
+            with self.storage.batch():
+                self.assertIs(self.storage._batch.conn, conn)
+                self._store('inner')
+            # Still open after the inner block
+            self.assertIs(self.storage._batch.conn, conn)
+            self.assertTrue(conn.in_transaction)
+            self._store('outer')
+        self.assertIsNone(self.storage._batch.conn)
+        self.assertEqual(len(self.storage.get_haproxy_stats(self.run_id)), 2)
+
+    def test_error_rolls_back(self):
+        with self.assertRaises(RuntimeError):
+            with self.storage.batch():
+                with self.storage.batch():
+                    self._store()
+                raise RuntimeError
+        self.assertEqual(self.storage.get_haproxy_stats(self.run_id), [])
+        self.assertIsNone(self.storage._batch.conn)
+
+    def test_batch_is_per_thread(self):
+        seen = []
+        with self.storage.batch():
+            thread = threading.Thread(
+                target=lambda: seen.append(
+                    getattr(self.storage._batch, 'conn', None)
+                )
+            )
+            thread.start()
+            thread.join()
+        self.assertEqual(seen, [None])
+
+
+class TimestampStorageTest(StorageTestCase):
+
+    def test_rows_have_iso_timestamps(self):
+        before = _now_us()
+        self._store()
+        row, = self.storage.get_haproxy_stats(self.run_id)
+        self.assertGreaterEqual(_to_us(row['timestamp']), before)
+        self.assertEqual(row['scur'], 3)
+
+    def test_time_filters(self):
+        self._store()
+        row, = self.storage.get_haproxy_stats(self.run_id)
+        ts = _to_us(row['timestamp'])
+
+        for start in (ts, row['timestamp']):
+            self.assertEqual(
+                len(self.storage.get_haproxy_stats(self.run_id, start)), 1
+            )
+        self.assertEqual(
+            self.storage.get_haproxy_stats(self.run_id, ts + 1), []
+        )
+        self.assertEqual(
+            self.storage.get_haproxy_stats(
+                self.run_id, end_time=_us_to_iso(ts - 1)
+            ),
+            []
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+"""Tests for the SSH command plumbing in collectors.system_metrics."""
+
+import io
+import unittest
+from unittest import mock
+
+import paramiko
+
+from collectors import system_metrics
+from collectors.system_metrics import (
+    SystemMetricsCollector, _parse_net_dev_bulk
+)
+
+_END = SystemMetricsCollector._END_MARK
+
+
+def _channel(*chunks):
+    """A mock shell channel whose recv() returns chunks, then EOF."""
+    channel = mock.Mock()
+    channel.recv.side_effect = list(chunks) + [b'']
+    return channel
+
+
+def _exec_result(output):
+    """exec_command() return value with the given stdout."""
+    return io.BytesIO(), io.BytesIO(output), io.BytesIO()
+
+
+class ExecuteCommandTest(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = SystemMetricsCollector('192.0.2.20', 'backend-1')
+        self.client = mock.Mock()
+        self.collector._ssh_client = self.client
+        self.collector._open_channel = mock.Mock()
+
+    def test_output_framed_by_end_mark(self):
+        channel = _channel(b'4\n' + _END)
+        self.collector._open_channel.return_value = channel
+
+        self.assertEqual(self.collector._execute_command('nproc'), '4')
+        channel.sendall.assert_called_once_with(
+            ('nproc' + SystemMetricsCollector._END_COMMAND).encode('utf-8')
+        )
+        self.client.exec_command.assert_not_called()
+
+    def test_end_mark_split_across_chunks(self):
+        self.collector._open_channel.return_value = _channel(
+            b'a\n', _END[:5], _END[5:]
+        )
+        self.assertEqual(self.collector._execute_command('echo a'), 'a')
+
+    def test_channel_reused(self):
+        channel = _channel(b'1' + _END, b'2' + _END)
+        self.collector._open_channel.return_value = channel
+
+        self.assertEqual(self.collector._execute_command('echo 1'), '1')
+        self.assertEqual(self.collector._execute_command('echo 2'), '2')
+        self.collector._open_channel.assert_called_once()
+
+    def test_closed_channel_falls_back_to_exec(self):
+        channel = _channel(b'partial')
+        self.collector._open_channel.return_value = channel
+        self.client.exec_command.return_value = _exec_result(b'4\n')
+
+        self.assertEqual(self.collector._execute_command('nproc'), '4')
+        channel.close.assert_called_once()
+        self.client.exec_command.assert_called_once_with('nproc')
+        self.assertEqual(self.collector._channels, [])
+
+    def test_open_failure_falls_back_to_exec(self):
+        self.collector._open_channel.side_effect = paramiko.SSHException()
+        self.client.exec_command.return_value = _exec_result(b'4\n')
+
+        self.assertEqual(self.collector._execute_command('nproc'), '4')
+
+    def test_dropped_connection_reconnects(self):
+        self.collector._open_channel.side_effect = EOFError()
+        self.client.exec_command.side_effect = EOFError()
+        fresh = mock.Mock()
+        fresh.exec_command.return_value = _exec_result(b'4\n')
+
+        def reconnect():
+            self.collector._ssh_client = fresh
+
+        self.collector._reconnect = mock.Mock(side_effect=reconnect)
+        self.assertEqual(self.collector._execute_command('nproc'), '4')
+        self.collector._reconnect.assert_called_once()
+
+
+class ExecuteBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = SystemMetricsCollector('192.0.2.20', 'backend-1')
+        self.collector._execute_command = mock.Mock()
+
+    def test_one_exec_for_all_commands(self):
+        self.collector._execute_command.return_value = ''
+        self.collector._execute_batch([
+            ('load', 'cat /proc/loadavg'), ('cpu_count', 'nproc')
+        ])
+        self.collector._execute_command.assert_called_once_with(
+            "echo '---load---'; cat /proc/loadavg; "
+            "echo '---cpu_count---'; nproc"
+        )
+
+    def test_output_split_by_section(self):
+        self.collector._execute_command.return_value = (
+            '---load---\n0.50 0.40 0.30 1/100 42\n'
+            '---empty---\n'
+            '---cpu_count---\n4'
+        )
+        self.assertEqual(
+            self.collector._execute_batch([
+                ('load', 'cat /proc/loadavg'),
+                ('empty', 'true'),
+                ('cpu_count', 'nproc'),
+            ]),
+            {'load': '0.50 0.40 0.30 1/100 42', 'empty': '', 'cpu_count': '4'}
+        )
+
+    def test_marker_inside_line_not_a_boundary(self):
+        self.collector._execute_command.return_value = (
+            '---disk---\n/dev/x ---mnt--- 1'
+        )
+        self.assertEqual(
+            self.collector._execute_batch([('disk', 'df -B1 /')]),
+            {'disk': '/dev/x ---mnt--- 1'}
+        )
+
+
+_NET_DEV_HEADER = (
+    'Inter-|   Receive                            '
+    '                    |  Transmit\n'
+    ' face |bytes    packets errs drop fifo frame compressed multicast'
+    '|bytes    packets errs drop fifo colls carrier compressed\n'
+)
+
+
+def _net_dev_line(interface, base):
+    return f'{interface:>6}: ' + ' '.join(
+        str(base + column) for column in range(16)
+    )
+
+
+class ParseNetworkStatsTest(unittest.TestCase):
+
+    def _parse_loop(self, output):
+        with mock.patch.object(system_metrics, 'NUMPY_AVAILABLE', False):
+            return SystemMetricsCollector._parse_network_stats(output)
+
+    def test_filtered_output_without_headers(self):
+        self.assertEqual(
+            SystemMetricsCollector._parse_network_stats(
+                _net_dev_line('ens3', 100)
+            ),
+            {'ens3': {
+                'rx_bytes': 100, 'rx_packets': 101, 'rx_errors': 102,
+                'rx_dropped': 103, 'tx_bytes': 108, 'tx_packets': 109,
+                'tx_errors': 110, 'tx_dropped': 111,
+            }}
+        )
+
+    @unittest.skipUnless(system_metrics.NUMPY_AVAILABLE, 'needs numpy')
+    def test_bulk_matches_loop(self):
+        # Counters past 2**53 would lose precision through a float
+        count = system_metrics._NUMPY_NET_DEV_MIN + 8
+        output = _NET_DEV_HEADER + '\n'.join(
+            _net_dev_line(f'veth{n}', 2 ** 63 + n * 1000)
+            for n in range(count)
+        )
+        interfaces = [f'veth{n}' for n in range(count)]
+        counters = [line.partition(':')[2] for line in output.split('\n')
+                    if ':' in line]
+
+        bulk = _parse_net_dev_bulk(interfaces, counters)
+        self.assertEqual(bulk, self._parse_loop(output))
+        self.assertEqual(
+            SystemMetricsCollector._parse_network_stats(output), bulk
+        )
+        self.assertEqual(bulk['veth3']['tx_dropped'], 2 ** 63 + 3011)
+        self.assertIs(type(bulk['veth3']['tx_dropped']), int)
+
+    @unittest.skipUnless(system_metrics.NUMPY_AVAILABLE, 'needs numpy')
+    def test_odd_column_count_uses_loop(self):
+        count = system_metrics._NUMPY_NET_DEV_MIN
+        lines = [_net_dev_line(f'veth{n}', n) for n in range(count)]
+        lines[1] += ' 99'
+        output = '\n'.join(lines)
+
+        self.assertIsNone(_parse_net_dev_bulk(
+            [f'veth{n}' for n in range(count)],
+            [line.partition(':')[2] for line in lines]
+        ))
+        result = SystemMetricsCollector._parse_network_stats(output)
+        self.assertEqual(result, self._parse_loop(output))
+        self.assertEqual(len(result), count)
+
+
+if __name__ == '__main__':
+    unittest.main()